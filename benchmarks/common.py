@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+from datetime import datetime
+
+from config import TestingConfig
+
+
+class BenchConfig(TestingConfig):
+    # Budgets and statement echo would distort the numbers
+    QUERY_BUDGET_ENFORCED = False
+    SQLALCHEMY_ECHO = False
+
+
+def percentile(values, pct):
+    """
+    :param values: sorted list of numbers
+    :param pct: percentile between 0 and 100
+    """
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def save_results(path, results, **meta):
+    """Write results with enough metadata to compare runs later.
+
+    :param path: JSON file to write, parent directories are created
+    :param results: benchmark results
+    :param meta: run parameters
+    """
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as output:
+        json.dump({
+            'commit': commit,
+            'created_at': datetime.utcnow().isoformat(),
+            'meta': meta,
+            'results': results,
+        }, output, indent=2, sort_keys=True)
@@ -0,0 +1,37 @@
+"""Compare two result files written by ``benchmarks.load``.
+
+Run with ``python -m benchmarks.compare results/before.json results/after.json``.
+"""
+import json
+import sys
+
+
+def cell(old, new):
+    """Format the new value and its change, 'n/a' where there is no baseline.
+
+    :param old: value from the baseline run, may be None or 0
+    :param new: value from the compared run, may be None
+    """
+    if new is None:
+        return f'{"n/a":>9} {"":>7}'
+    if not old:
+        return f'{new:9.1f} {"n/a":>7}'
+    return f'{new:9.1f} {(new - old) / old * 100:+6.1f}%'
+
+
+def main(before_path, after_path):
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before = json.load(before_file)['results']
+        after = json.load(after_file)['results']
+
+    print(f'{"scenario":28} {"rps":>17} {"p50 ms":>17} {"p99 ms":>17}')
+    for name in sorted(set(before) & set(after)):
+        cells = [
+            cell(before[name].get(key), after[name].get(key))
+            for key in ('rps', 'p50_ms', 'p99_ms')
+        ]
+        print(f'{name:28} ' + ' '.join(cells))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
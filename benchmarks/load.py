@@ -0,0 +1,230 @@
+"""Concurrent load test for the studio and manager routes.
+
+Start the API (e.g. gunicorn) against a database seeded with
+``benchmarks.seed``, then run::
+
+    python -m benchmarks.load --url http://localhost:5000 \\
+        --concurrency 16 --requests 2000 --output results/run.json
+
+Every scenario is measured separately and the p50/p90/p99 latency and
+throughput are written as JSON, see ``benchmarks.compare``. Write
+scenarios sign access tokens for the seeded managers, so run it with the
+same AUTH_SIGNING_KEYS as the API. The import scenario signs for the
+first manager in ADMIN_MANAGER_IDS and only runs when it is set.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+from sqlalchemy import text
+
+from benchmarks.common import BenchConfig, percentile, save_results
+from tsdip import create_app, db, permissions, tokens
+
+
+def sample_owners(session, limit=1000):
+    """Return (manager id, studio id) pairs of seeded studio owners."""
+    rows = session.execute(text(
+        "SELECT permission.manager_id, permission.studio_id FROM permission "
+        "JOIN manager ON manager.id = permission.manager_id "
+        "WHERE manager.username LIKE 'bench-manager-%' "
+        "AND permission.role = 'owner' LIMIT :limit"
+    ), {'limit': limit}).fetchall()
+    if not rows:
+        raise SystemExit('Seed the database first: python -m benchmarks.seed')
+    return [(str(manager_id), str(studio_id)) for manager_id, studio_id in rows]
+
+
+def scenarios(owners, run, admin_token=None, import_rows=100):
+    """Map scenario name to a function building the i-th request.
+
+    :param owners: sampled (manager id, studio id, access token) triples
+    :param run: unique prefix for rows created by write scenarios
+    :param admin_token: access token of an admin, enables the import scenario (Default value = None)
+    :param import_rows: CSV rows per import request (Default value = 100)
+    """
+    studios = [studio_id for _, studio_id, _ in owners]
+    managers = [manager_id for manager_id, _, _ in owners]
+
+    def pick(ids, i):
+        return ids[i % len(ids)]
+
+    def as_owner(i, method, path, body):
+        return method, path, body, pick(owners, i)[2]
+
+    def manager_body(i, suffix=''):
+        return {
+            'email': f'load-{run}-{i}{suffix}@example.com',
+            'username': f'load-{run}-{i}{suffix}',
+        }
+
+    def import_body(i):
+        lines = ['name,address'] + [
+            f'load-{run}-import-{i}-{n},{n} Load Street'
+            for n in range(import_rows)
+        ]
+        return '\n'.join(lines) + '\n'
+
+    available = {
+        'studios.get_list': lambda i: ('GET', '/studios?limit=20', None),
+        'studios.get_list.page': lambda i: (
+            'GET', f'/studios?limit=20&page={1 + i % 100}', None),
+        'studios.get_list.fields': lambda i: (
+            'GET', '/studios?limit=20&fields=name', None),
+        'studios.get_list.social': lambda i: (
+            'GET', '/studios?limit=20&include=social', None),
+        'studios.get': lambda i: ('GET', f'/studios/{pick(studios, i)}', None),
+        'studios.search': lambda i: (
+            'GET', f'/studios/search?q=bench-studio-{i % 1000}', None),
+        'studios.create': lambda i: as_owner(i, 'POST', '/studios/create', {
+            'address': f'{i} Load Street',
+            'name': f'load-{run}-{i}',
+        }),
+        'studios.patch_social': lambda i: as_owner(
+            i, 'PATCH', f'/studios/{pick(studios, i)}', {
+                'email': f'load-{run}-{i}@example.com',
+            }),
+        'managers.create': lambda i: (
+            'POST', '/managers/signup', manager_body(i, '-signup')),
+        'managers.invite': lambda i: as_owner(
+            i, 'POST', f'/managers/invite/{pick(studios, i)}',
+            manager_body(i, '-invite')),
+        'managers.bulk_invite': lambda i: as_owner(
+            i, 'POST', f'/managers/invite/{pick(studios, i)}/bulk', {
+                'managers': [manager_body(i, f'-bulk-{n}') for n in range(50)],
+            }),
+        'managers.get_studios': lambda i: (
+            'GET', f'/managers/{pick(managers, i)}/studios?include=social', None),
+    }
+    if admin_token:
+        available['studios.import'] = lambda i: (
+            'POST', '/studios/import?format=csv', import_body(i), admin_token)
+    return available
+
+
+def run_scenario(url, build, requests, concurrency):
+    """Send ``requests`` requests from ``concurrency`` keep-alive connections.
+
+    :param url: base URL of the API
+    :param build: function returning (method, path, body[, token]) for request i,
+        a str body is sent as CSV and anything else as JSON
+    :param requests: total number of requests
+    :param concurrency: number of client threads
+    """
+    target = urlparse(url)
+    latencies, errors = [], []
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80)
+        local, failed = [], 0
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+
+            method, path, body, *token = build(i)
+            headers = {}
+            if isinstance(body, str):
+                headers['Content-Type'] = 'text/csv'
+            elif body:
+                headers['Content-Type'] = 'application/json'
+                body = json.dumps(body)
+            if token:
+                headers['Authorization'] = f'Bearer {token[0]}'
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body or None, headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80)
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'errors': sum(errors),
+        'max_ms': latencies[-1] * 1000 if latencies else None,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else None,
+        'p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+        'p90_ms': percentile(latencies, 90) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--scenario', action='append',
+                        help='Only run these scenarios, may be repeated.')
+    parser.add_argument('--output', default='results/load.json')
+    args = parser.parse_args()
+
+    create_app(config=BenchConfig)
+    owners = [
+        (manager_id, studio_id, tokens.issue(manager_id, 'access', 86400))
+        for manager_id, studio_id in sample_owners(db.session)
+    ]
+    admin = min(permissions.admins, default=None)
+    admin_token = tokens.issue(admin, 'access', 86400) if admin else None
+    db.session.remove()
+
+    run = uuid.uuid4().hex[:8]
+    available = scenarios(owners, run, admin_token)
+    names = args.scenario or list(available)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise SystemExit(
+            f'Unknown scenario {", ".join(unknown)}, studios.import needs '
+            'ADMIN_MANAGER_IDS'
+        )
+
+    results = {}
+    for name in names:
+        results[name] = run_scenario(
+            args.url, available[name], args.requests, args.concurrency
+        )
+        res = results[name]
+        print(
+            f'{name:28} {res["rps"] or 0:8.1f} req/s  '
+            f'p50 {res["p50_ms"] or 0:7.2f} ms  '
+            f'p99 {res["p99_ms"] or 0:7.2f} ms  errors {res["errors"]}'
+        )
+
+    save_results(
+        args.output,
+        results,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        url=args.url
+    )
+
+
+if __name__ == '__main__':
+    main()
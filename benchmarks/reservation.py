@@ -0,0 +1,80 @@
+"""Concurrent reservation load test against a local Postgres.
+
+Creates one event with ``seats`` seats, lets ``threads`` workers reserve
+one seat at a time until it sells out, then checks nothing was oversold.
+
+Run with ``python -m benchmarks.reservation [seats] [threads]``.
+"""
+import sys
+import threading
+import time
+import uuid
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import BenchConfig
+from tsdip import create_app, db
+from tsdip.models import Event
+from tsdip.reservation import SoldOut, reserve_seats
+
+
+def worker(Session, event_id, counters, lock):
+    session = Session()
+    sold = rejected = 0
+    try:
+        while True:
+            try:
+                reserve_seats(session, event_id, 1)
+                sold += 1
+            except SoldOut:
+                session.rollback()
+                rejected += 1
+                break
+    finally:
+        session.close()
+        with lock:
+            counters['sold'] += sold
+            counters['rejected'] += rejected
+
+
+def main(seats=2000, threads=12):
+    create_app(config=BenchConfig)
+    Session = sessionmaker(bind=db.engine)
+
+    session = Session()
+    event = Event(name=f'bench-{uuid.uuid4()}', amount=seats)
+    session.add(event)
+    session.commit()
+    event_id = event.id
+    session.close()
+
+    counters = {'rejected': 0, 'sold': 0}
+    lock = threading.Lock()
+    pool = [
+        threading.Thread(target=worker, args=(Session, event_id, counters, lock))
+        for _ in range(threads)
+    ]
+
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    session = Session()
+    left = session.query(Event.amount).filter(Event.id == event_id).scalar()
+    session.query(Event).filter(Event.id == event_id).delete()
+    session.commit()
+    session.close()
+
+    print(f'seats={seats} threads={threads}')
+    print(f'sold={counters["sold"]} left={left} rejected={counters["rejected"]}')
+    print(f'throughput {counters["sold"] / elapsed:.0f} reservations/s')
+
+    if counters['sold'] != seats or left != 0:
+        raise SystemExit('Oversold or lost update detected')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
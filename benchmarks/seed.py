@@ -0,0 +1,114 @@
+"""Seed a local Postgres with benchmark data.
+
+Rows are generated server side with generate_series, so seeding a
+million studios takes seconds rather than a million round trips.
+
+Run with ``python -m benchmarks.seed --studios 100000 --events 100000``.
+"""
+import argparse
+
+from sqlalchemy import text
+
+from benchmarks.common import BenchConfig
+from tsdip import create_app, db
+
+STATEMENTS = (
+    # Socials first, studio n points at social n
+    """
+    INSERT INTO social (email, website)
+    SELECT 'bench-social-' || n || '@example.com',
+           'https://example.com/bench-social-' || n
+    FROM generate_series(1, :socials) AS n
+    """,
+    """
+    INSERT INTO studio (name, address, social_id)
+    SELECT 'bench-studio-' || n,
+           n || ' Dance Street, Taipei',
+           (SELECT id FROM social WHERE email = 'bench-social-' || n || '@example.com')
+    FROM generate_series(1, :studios) AS n
+    """,
+    """
+    INSERT INTO manager (username, email)
+    SELECT 'bench-manager-' || n, 'bench-manager-' || n || '@example.com'
+    FROM generate_series(1, :managers) AS n
+    """,
+    """
+    INSERT INTO permission (manager_id, studio_id, role)
+    SELECT manager.id, studio.id, 'owner'
+    FROM generate_series(1, :managers) AS n
+    JOIN manager ON manager.username = 'bench-manager-' || n
+    JOIN studio ON studio.name = 'bench-studio-' || (1 + n % :studios)
+    """,
+    """
+    INSERT INTO event (name, description, amount, price,
+                       reg_start_at, reg_end_at, start_at, end_at)
+    SELECT 'bench-event-' || n,
+           'Battle and workshop number ' || n,
+           100 + n % 400,
+           n % 3000,
+           now() - (n % 30) * interval '1 day',
+           now() + (n % 30) * interval '1 day',
+           now() + (n % 90) * interval '1 day',
+           now() + (n % 90) * interval '1 day' + interval '4 hours'
+    FROM generate_series(1, :events) AS n
+    """,
+    """
+    INSERT INTO request_log (request, request_id)
+    SELECT 'manager', id FROM manager WHERE username LIKE 'bench-manager-%'
+    """,
+)
+
+CLEANUP = (
+    # Rows written by benchmarks.load
+    "DELETE FROM mail_outbox WHERE to_email LIKE 'load-%'",
+    "DELETE FROM manager WHERE username LIKE 'load-%'",
+    "DELETE FROM studio WHERE name LIKE 'load-%'",
+    "DELETE FROM social WHERE email LIKE 'load-%'",
+    "DELETE FROM request_log WHERE request_id IN "
+    "(SELECT id FROM manager WHERE username LIKE 'bench-manager-%')",
+    "DELETE FROM event WHERE name LIKE 'bench-event-%'",
+    "DELETE FROM manager WHERE username LIKE 'bench-manager-%'",
+    "DELETE FROM studio WHERE name LIKE 'bench-studio-%'",
+    "DELETE FROM social WHERE email LIKE 'bench-social-%'",
+)
+
+
+def seed(session, studios, managers, events, socials):
+    """
+    :param session: database session
+    :param studios: number of studios
+    :param managers: number of managers, each owns one studio
+    :param events: number of events
+    :param socials: number of socials, attached to the first studios
+    """
+    params = {
+        'events': events,
+        'managers': managers,
+        'socials': min(socials, studios),
+        'studios': studios,
+    }
+    for statement in CLEANUP + STATEMENTS:
+        session.execute(text(statement), params)
+    session.commit()
+    session.execute(text('ANALYZE'))
+    session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--studios', type=int, default=10000)
+    parser.add_argument('--managers', type=int, default=1000)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--socials', type=int, default=5000)
+    args = parser.parse_args()
+
+    create_app(config=BenchConfig)
+    seed(db.session, args.studios, args.managers, args.events, args.socials)
+    print(
+        f'Seeded {args.studios} studios, {args.managers} managers, '
+        f'{args.events} events, {args.socials} socials.'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Compare the old and new list response serialization paths.
+
+Run with ``python -m benchmarks.serializer [rows] [repeat]``.
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime
+
+from flask import Flask, json
+
+from tsdip.models import Studio
+from tsdip.serializer import dumpb, orjson
+
+
+def make_rows(count):
+    now = datetime.now()
+    return [
+        Studio(
+            id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+            name=f'studio-{i}',
+            address=f'{i} Dance Street, Taipei',
+            social_id=uuid.uuid4(),
+        )
+        for i in range(count)
+    ]
+
+
+def old_path(rows):
+    data = [
+        {c.name: getattr(row, c.name) for c in row.__table__.columns}
+        for row in rows
+    ]
+    return json.dumps({'data': data, 'message': '', 'status': 'success'})
+
+
+def new_path(rows):
+    data = [row.as_dict() for row in rows]
+    return dumpb({'data': data, 'message': '', 'status': 'success'})
+
+
+def main(count=1000, repeat=50):
+    app = Flask(__name__)
+    rows = make_rows(count)
+
+    with app.app_context():
+        old = min(timeit.repeat(lambda: old_path(rows), number=1, repeat=repeat))
+    new = min(timeit.repeat(lambda: new_path(rows), number=1, repeat=repeat))
+
+    backend = 'orjson' if orjson is not None else 'json'
+    print(f'rows={count} backend={backend}')
+    print(f'old  {old * 1000:8.2f} ms')
+    print(f'new  {new * 1000:8.2f} ms')
+    print(f'speedup {old / new:.1f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -1,20 +1,24 @@
 import json
-import os
 
 import click
 from dotenv import load_dotenv
-from flask import g, request
+from flask import g
 from flask.cli import with_appcontext
 from flask_migrate import Migrate
 
 from tsdip import create_app, db
+from tsdip.authentication import prune_tokens_command
+from tsdip.exporter import export_command
+from tsdip.importer import import_studios_command
+from tsdip.indexes import check_indexes_command
+from tsdip.outbox import drain_outbox_command
 
 load_dotenv()
-config = 'config.DevelopmentConfig'
-if os.getenv('FLASK_ENV') == 'production':
-    config = 'config.ProductionConfig'
 
-app = create_app(config=config)
+# Config attributes read the environment, import it once .env is loaded
+from config import select_config  # noqa: E402
+
+app = create_app(config=select_config())
 migrate = Migrate(app, db)
 
 
@@ -26,24 +30,9 @@ if app.config['DEBUG']:
 @app.before_request
 def before_request():
     """ """
-    app.logger.debug('before_request')
-    app.logger.debug(f'Headers: {request.headers}')
-    app.logger.debug(f'Body: {request.get_data()}')
     g.db_session = db.session
 
 
-@app.after_request
-def after_request(response):
-    """
-    :param response:
-    """
-    app.logger.debug('after_request')
-    app.logger.debug(f'Status: {response.status}')
-    app.logger.debug(f'Headers: {response.headers}')
-    app.logger.debug(f'Body: {response.get_data()}')
-    return response
-
-
 @app.errorhandler(Exception)
 def handle_exception(e):
     """Return JSON instead of HTML for HTTP errors."""
@@ -72,3 +61,8 @@ def init_db_command():
 
 
 app.cli.add_command(init_db_command)
+app.cli.add_command(drain_outbox_command)
+app.cli.add_command(import_studios_command)
+app.cli.add_command(export_command)
+app.cli.add_command(check_indexes_command)
+app.cli.add_command(prune_tokens_command)
@@ -0,0 +1,43 @@
+"""Gunicorn settings, read from the same config class as the app.
+
+Run with ``gunicorn --config gunicorn.conf.py flasky:app``.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import select_config  # noqa: E402
+
+config = select_config()
+
+bind = config.GUNICORN_BIND
+keepalive = config.GUNICORN_KEEPALIVE
+max_requests = config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = config.GUNICORN_MAX_REQUESTS_JITTER
+threads = config.GUNICORN_THREADS
+timeout = config.GUNICORN_TIMEOUT
+worker_class = config.GUNICORN_WORKER_CLASS
+workers = config.GUNICORN_WORKERS
+
+# Import the app once in the master and fork it into the workers
+preload_app = True
+accesslog = '-'
+
+
+def pre_fork(server, worker):
+    """Close the master's connections, opened while preloading the app,
+    before they can be copied into a worker."""
+    from flasky import app
+    from tsdip import db
+
+    with app.app_context():
+        db.engine.dispose()
+
+
+def post_fork(server, worker):
+    """Start each worker with an empty pool, it opens its own connections."""
+    from flasky import app
+    from tsdip import db
+
+    with app.app_context():
+        db.engine.dispose()
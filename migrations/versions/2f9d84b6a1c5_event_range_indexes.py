@@ -0,0 +1,30 @@
+"""event range indexes
+
+Revision ID: 2f9d84b6a1c5
+Revises: d41b7e6c03fa
+Create Date: 2026-10-18 14:22:09.613874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f9d84b6a1c5'
+down_revision = 'd41b7e6c03fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_event_live_start_at_id', 'event', ['start_at', 'id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_event_live_reg_window', 'event', ['reg_end_at', 'reg_start_at'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_event_price', 'event', ['price'], unique=False)
+    op.create_index('ix_event_created_at_brin', 'event', ['created_at'], unique=False, postgresql_using='brin')
+
+
+def downgrade():
+    op.drop_index('ix_event_created_at_brin', table_name='event')
+    op.drop_index('ix_event_price', table_name='event')
+    op.drop_index('ix_event_live_reg_window', table_name='event')
+    op.drop_index('ix_event_live_start_at_id', table_name='event')
@@ -0,0 +1,41 @@
+"""mail outbox
+
+Revision ID: 5a1e0c7d2b94
+Revises: cbf42ed0c811
+Create Date: 2026-10-18 10:12:03.184527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5a1e0c7d2b94'
+down_revision = 'cbf42ed0c811'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mail_outbox',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v4()'), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('deleted_at', postgresql.TIMESTAMP(), nullable=True),
+    sa.Column('to_email', sa.String(length=255), nullable=False),
+    sa.Column('email_type', sa.String(length=32), server_default='SYSTEM', nullable=False),
+    sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+    sa.Column('status', postgresql.ENUM('pending', 'sent', 'failed', name='mail_status'), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('next_attempt_at', postgresql.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('sent_at', postgresql.TIMESTAMP(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_mail_outbox_pending', 'mail_outbox', ['next_attempt_at'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade():
+    op.drop_index('ix_mail_outbox_pending', table_name='mail_outbox')
+    op.drop_table('mail_outbox')
+    postgresql.ENUM(name='mail_status').drop(op.get_bind(), checkfirst=False)
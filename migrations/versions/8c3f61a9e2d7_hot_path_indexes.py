@@ -0,0 +1,34 @@
+"""hot path indexes
+
+Revision ID: 8c3f61a9e2d7
+Revises: 5a1e0c7d2b94
+Create Date: 2026-10-18 11:40:27.902113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3f61a9e2d7'
+down_revision = '5a1e0c7d2b94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_studio_live_name_id', 'studio', [sa.text('name DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_request_log_request_id', 'request_log', ['request_id'], unique=False)
+    op.create_index('ix_request_log_pending', 'request_log', ['request', 'created_at'], unique=False, postgresql_where=sa.text('approve IS false'))
+    op.create_index('ix_permission_studio_id', 'permission', ['studio_id'], unique=False)
+    op.create_index('ix_manager_email_lower', 'manager', [sa.text('lower(email)')], unique=False)
+    op.create_index('ix_social_email_lower', 'social', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_social_email_lower', table_name='social')
+    op.drop_index('ix_manager_email_lower', table_name='manager')
+    op.drop_index('ix_permission_studio_id', table_name='permission')
+    op.drop_index('ix_request_log_pending', table_name='request_log')
+    op.drop_index('ix_request_log_request_id', table_name='request_log')
+    op.drop_index('ix_studio_live_name_id', table_name='studio')
@@ -0,0 +1,26 @@
+"""request queue index
+
+Revision ID: b7e2c95d4f18
+Revises: 2f9d84b6a1c5
+Create Date: 2026-10-18 16:05:41.227305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c95d4f18'
+down_revision = '2f9d84b6a1c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_request_log_pending', table_name='request_log')
+    op.create_index('ix_request_log_pending', 'request_log', ['request', 'created_at'], unique=False, postgresql_where=sa.text('approve IS false AND approve_at IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_request_log_pending', table_name='request_log')
+    op.create_index('ix_request_log_pending', 'request_log', ['request', 'created_at'], unique=False, postgresql_where=sa.text('approve IS false'))
@@ -0,0 +1,31 @@
+"""trigram gist
+
+Revision ID: c3d9f0a18e64
+Revises: a4c8e1f27d53
+Create Date: 2026-10-19 10:12:31.508217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9f0a18e64'
+down_revision = 'a4c8e1f27d53'
+branch_labels = None
+depends_on = None
+
+TABLES = ('event', 'studio')
+
+
+def upgrade():
+    # GiST serves both the % filter and the <-> ordering of search candidates
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table)
+        op.create_index(f'ix_{table}_name_trgm', table, ['name'], unique=False, postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'})
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table)
+        op.create_index(f'ix_{table}_name_trgm', table, ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
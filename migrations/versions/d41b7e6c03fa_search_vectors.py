@@ -0,0 +1,50 @@
+"""search vectors
+
+Revision ID: d41b7e6c03fa
+Revises: 8c3f61a9e2d7
+Create Date: 2026-10-18 13:05:51.447360
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'd41b7e6c03fa'
+down_revision = '8c3f61a9e2d7'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = {
+    'event': 'name, description',
+    'studio': 'name, address',
+}
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for table, columns in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF {columns} ON {table}
+            FOR EACH ROW EXECUTE PROCEDURE
+            tsvector_update_trigger(search_vector, 'pg_catalog.simple', {columns})
+        """)
+        op.execute(f"""
+            UPDATE {table} SET search_vector = to_tsvector(
+                'pg_catalog.simple',
+                concat_ws(' ', {columns})
+            )
+        """)
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+        op.create_index(f'ix_{table}_name_trgm', table, ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    for table in SEARCH_COLUMNS:
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table)
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.execute(f'DROP TRIGGER {table}_search_vector_update ON {table}')
+        op.drop_column(table, 'search_vector')
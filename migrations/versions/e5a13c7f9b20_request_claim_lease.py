@@ -0,0 +1,28 @@
+"""request claim lease
+
+Revision ID: e5a13c7f9b20
+Revises: b7e2c95d4f18
+Create Date: 2026-10-18 18:42:13.508126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e5a13c7f9b20'
+down_revision = 'b7e2c95d4f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('request_log', sa.Column('claimed_by', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('request_log', sa.Column('claimed_until', postgresql.TIMESTAMP(), nullable=True))
+    op.create_foreign_key(None, 'request_log', 'manager', ['claimed_by'], ['id'], onupdate='CASCADE', ondelete='SET NULL')
+
+
+def downgrade():
+    op.drop_constraint('request_log_claimed_by_fkey', 'request_log', type_='foreignkey')
+    op.drop_column('request_log', 'claimed_until')
+    op.drop_column('request_log', 'claimed_by')
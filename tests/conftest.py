@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from flask import g
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from config import TestingConfig
+from tsdip import create_app, db
+
+
+class Config(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'TEST_DATABASE_URI',
+        TestingConfig.SQLALCHEMY_DATABASE_URI
+    )
+
+
+@pytest.fixture(scope='session')
+def app():
+    """App bound to the TEST_DATABASE_URI database, tables are recreated."""
+    try:
+        app = create_app(config=Config)
+        with db.engine.begin() as conn:
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    except (ImportError, OperationalError) as err:
+        pytest.skip(f'PostgreSQL is not reachable: {err}')
+
+    @app.before_request
+    def before_request():
+        g.db_session = db.session
+
+    db.drop_all()
+    db.create_all()
+    yield app
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture
+def session(app):
+    yield db.session
+    db.session.remove()
+    tables = ', '.join(table.name for table in db.metadata.sorted_tables)
+    with db.engine.begin() as conn:
+        conn.execute(text(f'TRUNCATE {tables} CASCADE'))
+
+
+@pytest.fixture
+def client(app, session):
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app):
+    """SQL statements run while the fixture is active, clear it between steps."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, 'after_cursor_execute', record)
+    yield executed
+    event.remove(db.engine, 'after_cursor_execute', record)
@@ -0,0 +1,42 @@
+from tsdip.approval import claim_pending, decide
+from tsdip.models import Manager, RequestLog
+
+
+def add_managers(session, count):
+    managers = [
+        Manager(username=f'dancer{index}', email=f'dancer{index}@example.com')
+        for index in range(count)
+    ]
+    session.add_all(managers)
+    session.flush()
+    session.add_all(
+        RequestLog(request='manager', request_id=manager.id) for manager in managers
+    )
+    session.commit()
+    return managers
+
+
+def test_claims_outlive_the_transaction(session):
+    first, second = add_managers(session, 2)
+
+    claimed = claim_pending(session, first.id, limit=1)
+    session.commit()
+    again = claim_pending(session, second.id, limit=5)
+    session.commit()
+
+    assert len(claimed) == 1
+    assert len(again) == 1
+    assert claimed[0].id != again[0].id
+    assert claim_pending(session, first.id) == []
+
+
+def test_decide_skips_requests_leased_to_others(session):
+    first, second = add_managers(session, 2)
+    mine = claim_pending(session, first.id, limit=1)
+    theirs = claim_pending(session, second.id, limit=1)
+    session.commit()
+
+    decided = decide(session, [mine[0].id, theirs[0].id], True, approve_by=first.id)
+    session.commit()
+
+    assert decided == [mine[0].id]
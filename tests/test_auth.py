@@ -0,0 +1,88 @@
+import pytest
+from flask import Flask
+
+from tsdip import permissions, tokens
+from tsdip.approval import claim_pending
+from tsdip.authentication import Tokens
+from tsdip.models import Manager, RequestLog
+
+
+def bearer(manager_id):
+    return {'Authorization': f'Bearer {tokens.issue(manager_id, "access", 60)}'}
+
+
+def add_manager(session, name, pending=False):
+    manager = Manager(username=name, email=f'{name}@example.com')
+    session.add(manager)
+    session.flush()
+    if pending:
+        session.add(RequestLog(request='manager', request_id=manager.id))
+    session.commit()
+    return manager
+
+
+def test_admin_routes_reject_anonymous_and_non_admins(client, session):
+    dancer = add_manager(session, 'dancer')
+
+    assert client.post('/requests/claim', json={}).status_code == 401
+    assert client.post('/studios/import').status_code == 401
+    assert client.get('/exports/studio').status_code == 403
+    res = client.post('/requests/claim', json={}, headers=bearer(dancer.id))
+    assert res.status_code == 403
+
+
+def test_decide_records_the_authenticated_approver(client, session, monkeypatch):
+    admin = add_manager(session, 'admin')
+    dancer = add_manager(session, 'dancer', pending=True)
+    monkeypatch.setattr(permissions, 'admins', frozenset([str(admin.id)]))
+    request_id = claim_pending(session, admin.id)[0].id
+    session.commit()
+
+    res = client.post('/requests/decide', headers=bearer(admin.id), json={
+        'approve': True,
+        'approve_by': str(dancer.id),
+        'ids': [str(request_id)],
+    })
+
+    assert res.status_code == 400
+    res = client.post('/requests/decide', headers=bearer(admin.id), json={
+        'approve': True,
+        'ids': [str(request_id)],
+    })
+    assert res.status_code == 200
+    assert session.query(RequestLog).get(request_id).approve_by == admin.id
+
+
+def test_refresh_rejects_managers_no_longer_active(client, session):
+    dancer = add_manager(session, 'dancer')
+    refresh_token = tokens.issue(dancer.id, 'refresh', 60)
+
+    res = client.post('/auth/refresh', json={'token': refresh_token})
+    assert res.status_code == 200
+    refresh_token = res.get_json()['data']['refresh_token']
+
+    session.add(RequestLog(request='manager', request_id=dancer.id))
+    session.commit()
+    res = client.post('/auth/refresh', json={'token': refresh_token})
+    assert res.status_code == 401
+
+
+def test_login_tokens_work_once_across_workers(client, session):
+    dancer = add_manager(session, 'dancer')
+    login_token = tokens.issue(dancer.id, 'login', 60)
+
+    assert client.post('/auth/token', json={'token': login_token}).status_code == 200
+    # Another worker has not seen the revocation in its own process
+    tokens._revoked.clear()
+    assert client.post('/auth/token', json={'token': login_token}).status_code == 401
+
+
+def test_signing_keys_are_required_outside_debug_and_testing():
+    app = Flask(__name__)
+    app.config['AUTH_SIGNING_KEYS'] = ''
+
+    with pytest.raises(ValueError, match='AUTH_SIGNING_KEYS'):
+        Tokens().init_app(app)
+
+    app.testing = True
+    Tokens().init_app(app)
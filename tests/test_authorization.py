@@ -0,0 +1,49 @@
+from tests.test_auth import add_manager, bearer
+from tests.test_manager import add_studio
+from tsdip import permissions
+from tsdip.models import Manager
+
+
+def test_cached_roles_cost_no_queries(session, statements):
+    dancer = add_manager(session, 'dancer')
+    permissions.roles(session, dancer.id)
+
+    statements.clear()
+    assert permissions.roles(session, dancer.id) == {}
+    assert statements == []
+
+    permissions.invalidate(dancer.id)
+    permissions.roles(session, dancer.id)
+    assert len(statements) == 1
+
+
+def test_creating_a_studio_refreshes_the_owner_roles(client, session):
+    dancer = add_manager(session, 'dancer')
+    assert permissions.roles(session, dancer.id) == {}
+
+    res = client.post('/studios/create', headers=bearer(dancer.id), json={
+        'address': 'Taipei',
+        'name': 'breakers',
+    })
+    assert res.status_code == 201
+    studio_id = res.get_json()['data']['id']
+
+    assert permissions.roles(session, dancer.id) == {studio_id: 'owner'}
+    res = client.post(f'/managers/invite/{studio_id}', headers=bearer(dancer.id), json={
+        'email': 'popper@example.com',
+        'username': 'popper',
+    })
+    assert res.status_code == 201
+
+
+def test_bulk_invite_grants_the_studio_to_new_managers(client, session):
+    owner = add_manager(session, 'owner')
+    studio = add_studio(session, owner)
+
+    res = client.post(f'/managers/invite/{studio.id}/bulk', headers=bearer(owner.id), json={
+        'managers': [{'email': 'popper@example.com', 'username': 'popper'}],
+    })
+    assert res.status_code == 201
+
+    popper = session.query(Manager).filter_by(username='popper').one()
+    assert permissions.roles(session, popper.id) == {str(studio.id): 'viewer'}
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from tests.test_auth import add_manager, bearer
+from tsdip import db
+from tsdip.models import Event
+
+
+def test_reserve_commits_and_rejects_sold_out(client, session):
+    manager = add_manager(session, 'dancer')
+    event = Event(name='battle', amount=3)
+    session.add(event)
+    session.commit()
+    url = f'/events/{event.id}/reserve'
+
+    res = client.post(url, json={'quantity': 2}, headers=bearer(manager.id))
+    assert res.status_code == 201
+    assert res.get_json()['data']['remaining'] == 1
+
+    res = client.post(url, json={'quantity': 2}, headers=bearer(manager.id))
+    assert res.status_code == 409
+
+    with db.engine.connect() as conn:
+        amount = conn.execute(
+            text('SELECT amount FROM event WHERE id = :id'), {'id': event.id}
+        ).scalar()
+    assert amount == 1
+
+
+def test_list_defaults_to_upcoming_events(client, session):
+    now = datetime.utcnow()
+    for name, days in (('past', -10), ('soon', 5), ('later', 20)):
+        session.add(Event(name=name, start_at=now + timedelta(days=days)))
+    session.add(Event(name='unscheduled'))
+    session.commit()
+
+    def names(url):
+        res = client.get(url)
+        assert res.status_code == 200
+        return [item['name'] for item in res.get_json()['data']['items']]
+
+    assert names('/events') == ['soon', 'later']
+    start_from = (now - timedelta(days=30)).isoformat()
+    assert names(f'/events?start_from={start_from}') == ['past', 'soon', 'later']
+    start_to = (now + timedelta(days=10)).isoformat()
+    assert names(f'/events?start_to={start_to}') == ['soon']
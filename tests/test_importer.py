@@ -0,0 +1,30 @@
+import os
+
+from tests.test_auth import add_manager, bearer
+from tsdip import permissions
+from tsdip.models import Studio
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'studios.csv')
+
+
+def test_import_reports_rejects_and_keeps_valid_rows(client, session, monkeypatch):
+    admin = add_manager(session, 'admin')
+    monkeypatch.setattr(permissions, 'admins', frozenset([str(admin.id)]))
+    session.add(Studio(name='Existing', address='Taipei'))
+    session.commit()
+
+    with open(FIXTURE, 'rb') as csv_file:
+        res = client.post(
+            '/studios/import?format=csv',
+            data=csv_file.read(),
+            content_type='text/csv',
+            headers=bearer(admin.id)
+        )
+
+    assert res.status_code == 201
+    data = res.get_json()['data']
+    assert (data['inserted'], data['rejected']) == (3, 3)
+    assert [reject['line'] for reject in data['rejects']] == [3, 5, 6]
+
+    names = {name for name, in session.query(Studio.name)}
+    assert names == {'Breakers', 'Existing', 'Krumpers', 'Lockers'}
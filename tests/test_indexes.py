@@ -0,0 +1,33 @@
+from sqlalchemy import text
+
+from tsdip.indexes import HOT_QUERIES, explain_hot_queries
+
+
+def seed(session):
+    """Fill the searched tables so the planner works from real statistics."""
+    session.execute(text(
+        "INSERT INTO studio (name, address) "
+        "SELECT md5(n::text), n || ' Dance Road' FROM generate_series(1, 5000) n"
+    ))
+    session.execute(text(
+        "INSERT INTO event (name, start_at, reg_start_at, reg_end_at) "
+        "SELECT 'event ' || n, "
+        "timestamp '2019-01-01' + n * interval '1 hour', "
+        "timestamp '2018-12-01' + n * interval '1 hour', "
+        "timestamp '2018-12-15' + n * interval '1 hour' "
+        "FROM generate_series(1, 5000) n"
+    ))
+    session.commit()
+    for table in ('studio', 'event'):
+        session.execute(text(f'ANALYZE {table}'))
+    session.commit()
+
+
+def test_hot_queries_use_their_indexes(session):
+    seed(session)
+
+    results = explain_hot_queries(session)
+
+    assert len(results) == len(HOT_QUERIES)
+    for description, index, used in results:
+        assert index in used, f'{description} uses {sorted(used) or "no index"}'
@@ -0,0 +1,47 @@
+from tests.test_auth import add_manager, bearer
+from tsdip.models import MailOutbox, Manager, Studio, permission
+
+
+def add_studio(session, owner):
+    studio = Studio(name='breakers', address='Taipei')
+    session.add(studio)
+    session.flush()
+    session.execute(permission.insert().values(
+        manager_id=owner.id,
+        studio_id=studio.id,
+        role='owner'
+    ))
+    session.commit()
+    return studio
+
+
+def test_bulk_invite_reports_duplicates_and_invites_the_rest(client, session):
+    owner = add_manager(session, 'owner')
+    studio = add_studio(session, owner)
+    taken = Manager(username='popper', email='popper@example.com', telephone='0912')
+    session.add(taken)
+    session.commit()
+
+    res = client.post(f'/managers/invite/{studio.id}/bulk', json={'managers': [
+        {'email': 'locker@example.com', 'username': 'locker'},
+        {'email': 'POPPER@example.com', 'username': 'popper2'},
+        {'email': 'waacker@example.com', 'username': 'popper'},
+        {'email': 'house@example.com', 'username': 'house', 'telephone': '0912'},
+        {'email': 'not-an-address', 'username': 'krumper'},
+        {'email': 'locker@example.com', 'username': 'locker2'},
+        {'email': 'voguer@example.com', 'username': 'voguer'},
+    ]}, headers=bearer(owner.id))
+
+    assert res.status_code == 201
+    statuses = [item['status'] for item in res.get_json()['data']]
+    assert statuses == [
+        'invited', 'error', 'error', 'error', 'error', 'error', 'invited'
+    ]
+
+    invited = {'locker@example.com', 'voguer@example.com'}
+    emails = {email for email, in session.query(Manager.email)}
+    assert emails == {'owner@example.com', 'popper@example.com'} | invited
+    assert {row.to_email for row in session.query(MailOutbox)} == invited
+    members = session.query(permission.c.manager_id) \
+        .filter(permission.c.studio_id == studio.id).count()
+    assert members == 3
@@ -0,0 +1,67 @@
+import json
+from types import SimpleNamespace
+
+from tsdip.models import MailOutbox
+from tsdip.outbox import drain, enqueue
+
+
+def test_drain_sends_every_template_from_worker_threads(session):
+    # tsdip.mail reads the config at import time
+    from tsdip.mail import MailSink
+
+    for index in range(6):
+        email_type = 'SYSTEM' if index % 2 else 'LOGIN'
+        enqueue(session, f'dancer{index}@example.com', email_type=email_type)
+    session.commit()
+
+    mailer = MailSink()
+    sent, failed = drain(session, mailer, workers=2)
+
+    assert (sent, failed) == (6, 0)
+    assert len(mailer.outbox) == 6
+    assert session.query(MailOutbox).filter(MailOutbox.status != 'sent').count() == 0
+
+
+class FakeSendGridClient():
+    """Rejects whole requests naming invalid addresses like SendGrid v3."""
+
+    def __init__(self):
+        self.requests = []
+
+    def send(self, message):
+        from python_http_client.exceptions import BadRequestsError
+
+        emails = [
+            personalization['to'][0]['email']
+            for personalization in message.get()['personalizations']
+        ]
+        self.requests.append(emails)
+        errors = [
+            {
+                'field': f'personalizations.{index}.to.0.email',
+                'message': 'Does not contain a valid address.',
+            }
+            for index, email in enumerate(emails) if email.endswith('.invalid')
+        ]
+        if errors:
+            body = json.dumps({'errors': errors}).encode('utf-8')
+            raise BadRequestsError(400, 'Bad Request', body, {})
+        return SimpleNamespace(body=b'', headers={}, status_code=202)
+
+
+def test_bad_address_only_fails_itself(session):
+    from tsdip.mail import SendGrid
+
+    for email in ('dancer0@example.com', 'dancer@example.invalid', 'dancer1@example.com'):
+        enqueue(session, email)
+    session.commit()
+
+    mailer = SendGrid()
+    mailer.sg = FakeSendGridClient()
+    sent, failed = drain(session, mailer, max_attempts=1)
+
+    assert (sent, failed) == (2, 1)
+    assert sorted(mailer.sg.requests[-1]) == ['dancer0@example.com', 'dancer1@example.com']
+    row = session.query(MailOutbox).filter_by(to_email='dancer@example.invalid').one()
+    assert row.status == 'failed'
+    assert row.last_error == 'Does not contain a valid address.'
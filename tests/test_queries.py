@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import text
+
+from tsdip.queries import QueryBudgetExceeded, query_budget
+
+
+def run_queries(session, count):
+    for _ in range(count):
+        session.execute(text('SELECT 1'))
+    return count
+
+
+def test_query_budget_fails_when_exceeded(app, session):
+    view = query_budget(2)(run_queries)
+
+    with app.test_request_context('/studios'):
+        assert view(session, 2) == 2
+        with pytest.raises(QueryBudgetExceeded, match='ran 3 queries, budget is 2'):
+            view(session, 3)
+
+
+def test_queries_are_counted_once_per_request(client, session):
+    res = client.get('/studios?include=social')
+
+    assert res.status_code == 200
+    assert 'desc="1 queries"' in res.headers['Server-Timing']
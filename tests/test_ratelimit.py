@@ -0,0 +1,70 @@
+from flask import Blueprint, Flask
+
+from tsdip.ratelimit import MemoryBuckets, RateLimiter
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_refills_at_its_rate():
+    clock = FakeClock()
+    buckets = MemoryBuckets(clock=clock)
+
+    assert buckets.take('a', capacity=2, rate=0.5) == (True, 0)
+    assert buckets.take('a', capacity=2, rate=0.5) == (True, 0)
+    assert buckets.take('a', capacity=2, rate=0.5) == (False, 2.0)
+
+    clock.now += 1
+    assert buckets.take('a', capacity=2, rate=0.5) == (False, 1.0)
+    clock.now += 1
+    assert buckets.take('a', capacity=2, rate=0.5) == (True, 0)
+
+    clock.now += 60
+    assert buckets.take('a', capacity=2, rate=0.5) == (True, 0)
+    assert buckets.take('a', capacity=2, rate=0.5) == (True, 0)
+    assert buckets.take('a', capacity=2, rate=0.5)[0] is False
+
+
+def make_app(clock):
+    app = Flask(__name__)
+    app.config.update(
+        RATELIMIT_ENABLED=True,
+        RATELIMIT_LIMITS={'studios': (2, 60)},
+    )
+    blueprint = Blueprint('studios', __name__, url_prefix='/studios')
+
+    @blueprint.route('', methods=['GET', 'POST'])
+    def studios():
+        return 'ok'
+
+    app.register_blueprint(blueprint)
+    limiter = RateLimiter()
+    limiter.init_app(app)
+    limiter.backend = MemoryBuckets(clock=clock)
+    return app
+
+
+def test_limiter_returns_429_with_retry_after_per_client():
+    clock = FakeClock()
+    client = make_app(clock).test_client()
+    first = {'REMOTE_ADDR': '10.0.0.1'}
+    second = {'REMOTE_ADDR': '10.0.0.2'}
+
+    assert client.post('/studios', environ_base=first).status_code == 200
+    assert client.post('/studios', environ_base=first).status_code == 200
+    res = client.post('/studios', environ_base=first)
+    assert res.status_code == 429
+    assert res.headers['Retry-After'] == '30'
+    assert res.get_json()['code'] == 601
+
+    assert client.post('/studios', environ_base=second).status_code == 200
+    assert client.get('/studios', environ_base=first).status_code == 200
+
+    clock.now += 30
+    assert client.post('/studios', environ_base=first).status_code == 200
@@ -0,0 +1,20 @@
+from tsdip.models import Studio
+from tsdip.search import search
+
+
+def test_exact_name_survives_the_candidate_cap(session):
+    session.add_all(
+        Studio(name=f'hiphop studio {index}', address='Taipei')
+        for index in range(20)
+    )
+    session.add(Studio(name='hiphop', address='Taipei'))
+    session.commit()
+
+    result = search(session, Studio, 'hiphop', limit=3, candidates=5)
+
+    assert len(result) == 3
+    assert result[0]['name'] == 'hiphop'
+
+
+def test_search_rejects_short_queries(client):
+    assert client.get('/studios/search?q=hi').status_code == 400
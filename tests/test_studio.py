@@ -0,0 +1,73 @@
+from tests.test_auth import add_manager, bearer
+from tests.test_manager import add_studio
+from tsdip import cache
+from tsdip.cache import MemoryBackend
+from tsdip.models import Social, Studio
+
+
+def add_studios(session, count):
+    for index in range(count):
+        social = Social(email=f'studio{index}@example.com')
+        session.add(social)
+        session.flush()
+        session.add(Studio(
+            name=f'studio{index:02}',
+            address='Taipei',
+            social_id=social.id
+        ))
+    session.commit()
+
+
+def test_list_with_socials_runs_two_queries_per_page(client, session, statements):
+    add_studios(session, 12)
+
+    names, counts, cursor = [], [], None
+    while True:
+        statements.clear()
+        url = '/studios?include=social&limit=5'
+        res = client.get(f'{url}&cursor={cursor}' if cursor else url)
+        assert res.status_code == 200
+        counts.append(len(statements))
+
+        data = res.get_json()['data']
+        names += [item['name'] for item in data['items']]
+        assert all(item['social']['email'] for item in data['items'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+
+    assert names == [f'studio{index:02}' for index in reversed(range(12))]
+    assert counts == [2, 2, 2]
+
+
+def test_list_rejects_page_size_out_of_range(client):
+    assert client.get('/studios?limit=0').status_code == 400
+    assert client.get('/studios?limit=51').status_code == 400
+
+
+def test_patching_socials_invalidates_cached_studio(client, session, statements, monkeypatch):
+    monkeypatch.setattr(cache, 'backend', MemoryBackend())
+    owner = add_manager(session, 'owner')
+    studio = add_studio(session, owner)
+    url = f'/studios/{studio.id}?include=social'
+
+    assert client.get(url).get_json()['data']['social'] is None
+    statements.clear()
+    assert client.get(url).status_code == 200
+    assert statements == []
+
+    res = client.patch(f'/studios/{studio.id}', headers=bearer(owner.id), json={
+        'email': 'breakers@example.com',
+        'fan_page': 'breakers',
+        'instagram': 'breakers',
+        'line': 'breakers',
+        'telephone': '0912',
+        'website': 'https://breakers.example.com',
+        'youtube': 'breakers',
+    })
+    assert res.status_code == 201
+
+    statements.clear()
+    data = client.get(url).get_json()['data']
+    assert len(statements) == 1
+    assert data['social']['email'] == 'breakers@example.com'
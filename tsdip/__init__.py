@@ -3,21 +3,55 @@ import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import MetaData
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from tsdip import access_log, instrumentation, queries
+from tsdip.authentication import Tokens
+from tsdip.authorization import PermissionCache
+from tsdip.cache import Cache
+from tsdip.pool import engine_options
+from tsdip.ratelimit import RateLimiter
 
 metadata = MetaData()
 db = SQLAlchemy(metadata=metadata)
+cache = Cache()
+permissions = PermissionCache()
+limiter = RateLimiter()
+tokens = Tokens()
 
 
 def create_app(config=None):
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app)
+    hops = app.config.get('PROXY_FIX_HOPS', 0)
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
     app.app_context().push()
     db.init_app(app)
-
+    cache.init_app(app)
+    permissions.init_app(app, cache.backend)
+    tokens.init_app(app)
+    instrumentation.init_app(app)
+    queries.init_app(app, db.engine)
+    access_log.init_app(app)
+    # Last, so throttled requests are still timed and logged
+    limiter.init_app(app)
+
+    from .routes.auth import api_blueprint as auth_blueprint
+    from .routes.event import api_blueprint as event_blueprint
+    from .routes.export import api_blueprint as export_blueprint
     from .routes.manager import api_blueprint as manager_blueprint
+    from .routes.metrics import api_blueprint as metrics_blueprint
+    from .routes.request_log import api_blueprint as request_log_blueprint
     from .routes.studio import api_blueprint as studio_blueprint
 
+    app.register_blueprint(auth_blueprint)
+    app.register_blueprint(event_blueprint)
+    app.register_blueprint(export_blueprint)
     app.register_blueprint(manager_blueprint)
+    app.register_blueprint(metrics_blueprint)
+    app.register_blueprint(request_log_blueprint)
     app.register_blueprint(studio_blueprint)
 
     # a simple page that says hello
@@ -0,0 +1,113 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+from tsdip.serializer import dumps
+
+logger = logging.getLogger('tsdip.access')
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    Access records only carry plain values, so they are safe to hand over
+    unformatted.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        return dumps(getattr(record, 'access', {'message': record.getMessage()}))
+
+
+def _truncate(data, limit):
+    if len(data) > limit:
+        return data[:limit].decode('utf-8', 'replace') + '...'
+    return data.decode('utf-8', 'replace')
+
+
+def init_app(app):
+    """Log one structured line per sampled request without blocking it.
+
+    Records go through a queue to a listener thread, which formats and
+    writes them. The thread is started by the first request of each
+    process, so workers forked from a preloaded app get their own.
+    Request bodies are only logged with ACCESS_LOG_BODY on and when they
+    fit in ACCESS_LOG_BODY_LIMIT bytes, response bodies of non-streamed
+    messages are cut to that size.
+
+    :param app: Flask app
+    """
+    if not app.config.get('ACCESS_LOG_ENABLED'):
+        return
+
+    sample_rate = app.config.get('ACCESS_LOG_SAMPLE_RATE', 1.0)
+    log_body = app.config.get('ACCESS_LOG_BODY', False)
+    body_limit = app.config.get('ACCESS_LOG_BODY_LIMIT', 1024)
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    listener = {'pid': None}
+    lock = threading.Lock()
+
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    def start_listener():
+        pid = os.getpid()
+        with lock:
+            if listener['pid'] == pid:
+                return
+            # A fresh queue, records queued before a fork stay behind
+            queue_handler.queue = queue.SimpleQueue()
+            thread = QueueListener(queue_handler.queue, handler)
+            thread.start()
+            atexit.register(thread.stop)
+            listener['pid'] = pid
+
+    @app.before_request
+    def start_access_log():
+        if listener['pid'] != os.getpid():
+            start_listener()
+        g.access_started = time.perf_counter()
+
+    @app.after_request
+    def write_access_log(response):
+        if 'access_started' not in g:
+            return response
+        if response.status_code < 500 and random.random() >= sample_rate:
+            return response
+
+        access = {
+            'duration_ms': round((time.perf_counter() - g.access_started) * 1000, 2),
+            'endpoint': request.endpoint,
+            'method': request.method,
+            'path': request.path,
+            'remote_addr': request.remote_addr,
+            'size': response.content_length,
+            'status': response.status_code,
+        }
+
+        if log_body:
+            # Oversized request bodies are not read again just to log them
+            length = request.content_length
+            if length is not None and length <= body_limit:
+                access['request_body'] = _truncate(request.get_data(), body_limit)
+            if not response.is_streamed:
+                access['response_body'] = _truncate(response.get_data(), body_limit)
+
+        logger.info('access', extra={'access': access})
+        return response
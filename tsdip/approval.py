@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from sqlalchemy import func, or_, update
+
+from tsdip.models import Event, Manager, RequestLog, Studio
+
+table = RequestLog.__table__
+
+# Columns embedded as the target summary of each request type
+TARGETS = {
+    'event': (Event, ('id', 'name', 'start_at', 'deleted_at')),
+    'manager': (Manager, ('id', 'username', 'email', 'deleted_at')),
+    'studio': (Studio, ('id', 'name', 'address', 'deleted_at')),
+}
+
+# Rejected requests keep approve false but get approve_at, so both are
+# needed to tell pending rows apart. Matches ix_request_log_pending.
+PENDING = (RequestLog.approve.is_(False), RequestLog.approve_at.is_(None))
+
+
+def claim_pending(session, claimed_by, request_type=None, limit=50, lease=300):
+    """Lease up to ``limit`` pending requests to ``claimed_by``, oldest first.
+
+    Candidates are picked with FOR UPDATE SKIP LOCKED and leased in the
+    same UPDATE, so concurrent claims never return the same rows. The
+    lease outlives the transaction: other operators skip the rows until
+    ``claimed_until`` has passed. The caller commits.
+
+    :param session: database session
+    :param claimed_by: Manager id of the operator
+    :param request_type: 'studio', 'event' or 'manager' (Default value = None)
+    :param limit: rows to claim (Default value = 50)
+    :param lease: seconds the claim lasts (Default value = 300)
+    :returns: the claimed RequestLog rows
+    """
+    now = func.current_timestamp()
+    candidates = session.query(RequestLog.id) \
+        .filter(*PENDING) \
+        .filter(or_(
+            RequestLog.claimed_until.is_(None),
+            RequestLog.claimed_until < now
+        ))
+    if request_type is not None:
+        candidates = candidates.filter(RequestLog.request == request_type)
+    candidates = candidates \
+        .order_by(RequestLog.created_at) \
+        .limit(limit) \
+        .with_for_update(skip_locked=True)
+
+    stmt = update(table) \
+        .where(table.c.id.in_(candidates.statement)) \
+        .values(
+            claimed_by=claimed_by,
+            claimed_until=now + timedelta(seconds=lease)
+        ) \
+        .returning(table.c.id)
+    ids = [row[0] for row in session.execute(stmt)]
+    if not ids:
+        return []
+    return session.query(RequestLog) \
+        .filter(RequestLog.id.in_(ids)) \
+        .order_by(RequestLog.created_at) \
+        .all()
+
+
+def resolve_targets(session, rows):
+    """Load the studio, event or manager each request points at.
+
+    ``request_id`` has no foreign key, its table depends on ``request``.
+    Rows are grouped by type and each type is loaded with one IN query
+    over the summary columns, so any number of rows costs at most one
+    query per type.
+
+    :param session: database session
+    :param rows: RequestLog instances
+    :returns: dict of (request, request_id) to a summary dict, missing
+        targets are left out
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.request, set()).add(row.request_id)
+
+    targets = {}
+    for request_type, ids in groups.items():
+        model, names = TARGETS[request_type]
+        columns = [getattr(model, name) for name in names]
+        for values in session.query(*columns).filter(model.id.in_(ids)):
+            targets[(request_type, values[0])] = dict(zip(names, values))
+    return targets
+
+
+def decide(session, ids, approve, approve_by=None):
+    """Approve or reject pending requests with a single UPDATE.
+
+    Requests already decided, or leased to another operator whose claim
+    has not expired, are left alone, so a repeated or concurrent decision
+    does not overwrite the first one. The caller commits.
+
+    :param session: database session
+    :param ids: RequestLog ids
+    :param approve: True to approve, False to reject
+    :param approve_by: Manager id of the operator (Default value = None)
+    :returns: ids of the requests that were decided
+    """
+    stmt = update(table) \
+        .where(table.c.id.in_(ids)) \
+        .where(table.c.approve.is_(False)) \
+        .where(table.c.approve_at.is_(None)) \
+        .where(or_(
+            table.c.claimed_by.is_(None),
+            table.c.claimed_by == approve_by,
+            table.c.claimed_until < func.current_timestamp()
+        )) \
+        .values(
+            approve=approve,
+            approve_at=func.current_timestamp(),
+            approve_by=approve_by
+        ) \
+        .returning(table.c.id)
+    return [row[0] for row in session.execute(stmt)]
@@ -0,0 +1,239 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+from http import HTTPStatus
+
+import click
+from flask import g, request
+from flask.cli import with_appcontext
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+
+class TokenError(Exception):
+    """Raised when a token is malformed, badly signed, expired or revoked."""
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+def parse_keys(value):
+    """
+    :param value: comma separated ``kid:secret`` pairs
+    :returns: dict of key id to secret bytes
+    """
+    keys = {}
+    for pair in filter(None, (item.strip() for item in value.split(','))):
+        kid, _, secret = pair.partition(':')
+        if not kid or not secret:
+            raise ValueError(f'Signing key {kid!r} is not of the form kid:secret')
+        keys[kid] = secret.encode('utf-8')
+    return keys
+
+
+class Tokens():
+    """HS256 JSON Web Tokens for managers.
+
+    Signing keys and their encoded JWT headers are prepared once at
+    startup, so verifying an access token is a dict lookup, one HMAC and
+    a JSON decode, without touching the database. Access tokens are not
+    revocable and live minutes. Refresh and login tokens are single use:
+    trading one in records it in the revoked_token table, which every
+    worker shares, and in a local list that rejects repeats without a
+    query.
+    """
+
+    def __init__(self):
+        self.access_ttl = 900
+        self.login_ttl = 900
+        self.refresh_ttl = 86400
+        self.keys = {}
+        self.active_kid = None
+        self._headers = {}
+        self._kids = {}
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Load the signing keys and authenticate every request.
+
+        AUTH_SIGNING_KEYS is required outside debug and testing, where a
+        random key is generated instead and tokens stop working when the
+        process restarts.
+
+        :param app: Flask app
+        """
+        self.access_ttl = app.config.get('AUTH_ACCESS_TTL', 900)
+        self.login_ttl = app.config.get('AUTH_LOGIN_TTL', 900)
+        self.refresh_ttl = app.config.get('AUTH_REFRESH_TTL', 86400)
+
+        keys = parse_keys(app.config.get('AUTH_SIGNING_KEYS') or '')
+        if not keys:
+            if not (app.debug or app.testing):
+                raise ValueError('AUTH_SIGNING_KEYS must be set')
+            app.logger.warning('AUTH_SIGNING_KEYS is not set, using a random key')
+            keys = {'local': secrets.token_bytes(32)}
+        active_kid = app.config.get('AUTH_SIGNING_KEY_ID') or next(iter(keys))
+        if active_kid not in keys:
+            raise ValueError(f'AUTH_SIGNING_KEY_ID {active_kid} is not a signing key')
+
+        self.keys = keys
+        self.active_kid = active_kid
+        self._headers = {
+            kid: _b64encode(json.dumps(
+                {'alg': 'HS256', 'kid': kid, 'typ': 'JWT'},
+                separators=(',', ':'),
+                sort_keys=True
+            ).encode('utf-8'))
+            for kid in keys
+        }
+        self._kids = {header: kid for kid, header in self._headers.items()}
+        with self._lock:
+            self._revoked.clear()
+
+        app.before_request(self._authenticate)
+
+    def _sign(self, kid, signing_input):
+        return hmac.new(self.keys[kid], signing_input, hashlib.sha256).digest()
+
+    def issue(self, manager_id, kind, ttl):
+        """
+        :param manager_id: Manager id, the token subject
+        :param kind: 'access', 'refresh' or 'login'
+        :param ttl: lifetime in seconds
+        """
+        now = int(time.time())
+        payload = _b64encode(json.dumps({
+            'exp': now + ttl,
+            'iat': now,
+            'jti': uuid.uuid4().hex,
+            'sub': str(manager_id),
+            'typ': kind,
+        }, separators=(',', ':')).encode('utf-8'))
+        signing_input = self._headers[self.active_kid] + b'.' + payload
+        signature = _b64encode(self._sign(self.active_kid, signing_input))
+        return (signing_input + b'.' + signature).decode('ascii')
+
+    def issue_pair(self, manager_id):
+        """
+        :param manager_id: Manager id
+        """
+        return {
+            'access_token': self.issue(manager_id, 'access', self.access_ttl),
+            'expires_in': self.access_ttl,
+            'refresh_token': self.issue(manager_id, 'refresh', self.refresh_ttl),
+            'token_type': 'Bearer',
+        }
+
+    def verify(self, token, kind='access'):
+        """Return the payload of a valid token of type ``kind``.
+
+        :param token: encoded token
+        :param kind: expected type (Default value = 'access')
+        """
+        try:
+            header, payload, signature = token.encode('ascii').split(b'.')
+            kid = self._kids.get(header)
+            if kid is None:
+                raise TokenError('Unknown signing key')
+            expected = self._sign(kid, header + b'.' + payload)
+            if not hmac.compare_digest(expected, _b64decode(signature)):
+                raise TokenError('Bad signature')
+            claims = json.loads(_b64decode(payload))
+        except (UnicodeError, ValueError) as err:
+            raise TokenError(f'Malformed token: {err}')
+
+        if claims.get('typ') != kind:
+            raise TokenError(f'Expected a {kind} token')
+        if claims.get('exp', 0) <= time.time():
+            raise TokenError('Token has expired')
+        if kind != 'access' and self.is_revoked(claims['jti']):
+            raise TokenError('Token has been revoked')
+        return claims
+
+    def consume(self, session, claims):
+        """Revoke a refresh or login token until it would have expired.
+
+        The INSERT ... ON CONFLICT DO NOTHING makes using a token once
+        atomic across workers. The caller commits.
+
+        :param session: database session
+        :param claims: payload returned by ``verify``
+        :returns: False if the token had already been revoked
+        """
+        from tsdip.models import RevokedToken
+
+        table = RevokedToken.__table__
+        stmt = insert(table) \
+            .values(
+                expires_at=datetime.utcfromtimestamp(claims['exp']),
+                jti=claims['jti']
+            ) \
+            .on_conflict_do_nothing(index_elements=['jti']) \
+            .returning(table.c.jti)
+        consumed = session.execute(stmt).first() is not None
+
+        now = time.time()
+        with self._lock:
+            self._revoked = {
+                jti: exp for jti, exp in self._revoked.items() if exp > now
+            }
+            self._revoked[claims['jti']] = claims['exp']
+        return consumed
+
+    def is_revoked(self, jti):
+        """Revoked in this process, ``consume`` has the final word."""
+        with self._lock:
+            return jti in self._revoked
+
+    def _authenticate(self):
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return
+        try:
+            claims = self.verify(header[7:])
+        except TokenError:
+            return
+        g.manager_id = claims['sub']
+
+    def login_required(self, fn):
+        """Reject the request unless it carries a valid access token.
+
+        Apply it below ``format_response``.
+        """
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if g.get('manager_id') is None:
+                return {
+                    'code': 'ERROR_AUTH_1',
+                    'http_status_code': HTTPStatus.UNAUTHORIZED,
+                    'status': 'ERROR',
+                }
+            return fn(*args, **kwargs)
+        return wrapper
+
+
+@click.command('prune-tokens')
+@with_appcontext
+def prune_tokens_command():
+    """Delete revoked tokens that have expired anyway."""
+    from tsdip import db
+    from tsdip.models import RevokedToken
+
+    deleted = db.session.query(RevokedToken) \
+        .filter(RevokedToken.expires_at < func.timezone('UTC', func.now())) \
+        .delete(synchronize_session=False)
+    db.session.commit()
+    click.echo(f'Deleted {deleted} expired tokens.')
@@ -0,0 +1,195 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from http import HTTPStatus
+
+from flask import current_app as app
+from flask import g
+
+from tsdip.cache import NullBackend
+
+# Lowest to highest, a role grants everything the roles before it grant
+ROLES = ('viewer', 'manager', 'owner')
+RANK = {role: rank for rank, role in enumerate(ROLES)}
+
+
+class PermissionCache():
+    """Per-manager studio role maps cached in process.
+
+    Entries expire after a TTL and carry the manager's permission version,
+    a counter kept in the shared cache backend. Write paths that change
+    ``permission`` rows bump it, so with a shared backend every worker
+    drops its copy on the next check, otherwise the TTL bounds staleness.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or NullBackend()
+        self.ttl = 60
+        self.threshold = 10000
+        self.admins = frozenset()
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, backend):
+        """
+        :param app: Flask app
+        :param backend: CacheBackend holding the permission versions
+        """
+        self.backend = backend
+        self.ttl = app.config.get('PERMISSION_CACHE_TTL', 60)
+        self.threshold = app.config.get('PERMISSION_CACHE_THRESHOLD', 10000)
+        self.admins = frozenset(
+            str(uuid.UUID(manager_id.strip()))
+            for manager_id in (app.config.get('ADMIN_MANAGER_IDS') or '').split(',')
+            if manager_id.strip()
+        )
+        with self._lock:
+            self._entries.clear()
+
+    def _version(self, manager_id):
+        return self.backend.counter(f'perm:{manager_id}')
+
+    def _load(self, session, manager_id):
+        from tsdip.models import permission
+
+        rows = session.query(permission.c.studio_id, permission.c.role) \
+            .filter(
+                permission.c.manager_id == manager_id,
+                permission.c.deleted_at.is_(None)
+            )
+        return {str(studio_id): role for studio_id, role in rows}
+
+    def roles(self, session, manager_id):
+        """Return {studio id: role} for ``manager_id``, one query on a miss.
+
+        :param session: database session used on a miss
+        :param manager_id: Manager id
+        """
+        key = str(manager_id)
+        # Read before loading, an invalidation racing the load then
+        # leaves an entry that is already stale on the next check
+        version = self._version(key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now and entry[1] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        roles = self._load(session, key)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, version, roles)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.threshold:
+                self._entries.popitem(last=False)
+        return roles
+
+    def has_role(self, session, manager_id, studio_id, role):
+        """
+        :param session: database session
+        :param manager_id: Manager id
+        :param studio_id: Studio id
+        :param role: minimum role, 'owner', 'manager' or 'viewer'
+        """
+        granted = self.roles(session, manager_id).get(str(studio_id))
+        return granted is not None and RANK[granted] >= RANK[role]
+
+    def is_admin(self, manager_id):
+        """
+        :param manager_id: Manager id, may be None
+        """
+        return manager_id is not None and str(manager_id) in self.admins
+
+    def invalidate(self, *manager_ids):
+        """
+        :param manager_ids: managers whose permission rows changed
+        """
+        with self._lock:
+            for manager_id in manager_ids:
+                self._entries.pop(str(manager_id), None)
+        for manager_id in manager_ids:
+            self.backend.incr(f'perm:{manager_id}')
+
+    def require_role(self, role):
+        """Allow the route only if the current manager has ``role`` or higher
+        on the ``studio_id`` URL argument.
+
+        The manager is read from ``g.manager_id``. Apply it below
+        ``format_response``.
+
+        :param role: 'owner', 'manager' or 'viewer'
+        """
+        if role not in RANK:
+            raise ValueError(f'Unknown role {role}')
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                manager_id = g.get('manager_id')
+                if manager_id is None:
+                    return {
+                        'code': 'ERROR_AUTH_1',
+                        'http_status_code': HTTPStatus.UNAUTHORIZED,
+                        'status': 'ERROR',
+                    }
+
+                try:
+                    studio_id = uuid.UUID(str(kwargs['studio_id']))
+                    allowed = self.has_role(g.db_session, manager_id, studio_id, role)
+                except ValueError:
+                    allowed = False
+                except Exception as err:
+                    app.logger.error(err)
+                    g.db_session.rollback()
+                    allowed = False
+
+                if not allowed:
+                    return {
+                        'code': 'ERROR_AUTH_2',
+                        'description': f'{role} role is required',
+                        'http_status_code': HTTPStatus.FORBIDDEN,
+                        'status': 'ERROR',
+                    }
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def require_admin(self, fn):
+        """Allow the route only for managers listed in ADMIN_MANAGER_IDS.
+
+        Apply it below ``format_response``.
+        """
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            manager_id = g.get('manager_id')
+            if manager_id is None:
+                return {
+                    'code': 'ERROR_AUTH_1',
+                    'http_status_code': HTTPStatus.UNAUTHORIZED,
+                    'status': 'ERROR',
+                }
+            if not self.is_admin(manager_id):
+                return {
+                    'code': 'ERROR_AUTH_2',
+                    'description': 'admin is required',
+                    'http_status_code': HTTPStatus.FORBIDDEN,
+                    'status': 'ERROR',
+                }
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': size,
+        }
@@ -0,0 +1,214 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request
+
+
+class CacheBackend():
+    """Minimal key/value interface, a subset of the Redis commands."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, timeout):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        raise NotImplementedError
+
+    def counter(self, key):
+        raise NotImplementedError
+
+
+class NullBackend(CacheBackend):
+    """Backend that never stores anything, used to turn caching off."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout):
+        return False
+
+    def delete(self, key):
+        return False
+
+    def incr(self, key):
+        return 0
+
+    def counter(self, key):
+        return 0
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU with per-entry TTL."""
+
+    def __init__(self, threshold=1024):
+        self.threshold = threshold
+        self.evictions = 0
+        self._counters = {}
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at and expires_at < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.threshold:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def incr(self, key):
+        # Counters live outside the LRU, evicting one would resurrect stale keys
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counter(self, key):
+        return self._counters.get(key, 0)
+
+
+class RedisBackend(CacheBackend):
+    """Backend for any client speaking the redis-py API."""
+
+    def __init__(self, client, prefix='tsdip:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else pickle.loads(value)
+
+    def set(self, key, value, timeout):
+        return self.client.set(
+            self.prefix + key,
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            ex=timeout or None
+        )
+
+    def delete(self, key):
+        return bool(self.client.delete(self.prefix + key))
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def counter(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+
+class Cache():
+    """Response payload cache, invalidated per namespace by write paths.
+
+    Every namespace has a generation counter which is part of the key, so
+    invalidating a namespace is a single ``incr`` on any backend.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or NullBackend()
+        self.default_timeout = 60
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        cache_type = app.config.get('CACHE_TYPE', 'memory')
+        self.default_timeout = app.config.get('CACHE_DEFAULT_TIMEOUT', 60)
+
+        if cache_type == 'memory':
+            self.backend = MemoryBackend(
+                threshold=app.config.get('CACHE_THRESHOLD', 1024)
+            )
+        elif cache_type == 'redis':
+            import redis
+            self.backend = RedisBackend(
+                redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+            )
+        else:
+            self.backend = NullBackend()
+
+    def _generation(self, namespace):
+        return self.backend.counter(f'gen:{namespace}')
+
+    def make_key(self, namespace):
+        args = '&'.join(
+            f'{key}={value}' for key, value in sorted(request.args.items(multi=True))
+        )
+        return f'{namespace}:{self._generation(namespace)}:{request.path}?{args}'
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        return self.backend.set(key, value, timeout)
+
+    def invalidate(self, *namespaces):
+        """
+        :param namespaces: namespaces whose cached payloads become stale
+        """
+        for namespace in namespaces:
+            self.backend.incr(f'gen:{namespace}')
+
+    def cached(self, namespace, timeout=None):
+        """Cache successful route results keyed by path and query string.
+
+        Apply it below ``format_response`` so the cached value is the
+        result dict, not the response object.
+
+        :param namespace: invalidation namespace, e.g. 'studios'
+        :param timeout: TTL in seconds (Default value = None)
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = self.make_key(namespace)
+                res = self.get(key)
+                if res is not None:
+                    return res
+
+                res = fn(*args, **kwargs)
+                if res.get('status') == 'SUCCESS':
+                    self.set(key, res, timeout)
+                return res
+            return wrapper
+        return decorator
+
+    def stats(self):
+        return {
+            'evictions': getattr(self.backend, 'evictions', 0),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -8,10 +8,37 @@ class EmailTemplate(Enum):
 class ErrorCode(IntEnum):
     ROUTE_AUTH_0 = 0
 
+    ERROR_AUTH_1 = 501
+    ERROR_AUTH_2 = 502
+    ERROR_AUTH_3 = 503
+    ERROR_AUTH_4 = 504
+    ERROR_AUTH_5 = 505
+
     ERROR_MANAGER_1 = 101
     ERROR_MANAGER_2 = 102
     ERROR_MANAGER_3 = 103
     ERROR_MANAGER_4 = 104
+    ERROR_MANAGER_5 = 105
+    ERROR_MANAGER_6 = 106
+    ERROR_MANAGER_7 = 107
+
+    ERROR_EVENT_1 = 301
+    ERROR_EVENT_2 = 302
+    ERROR_EVENT_3 = 303
+    ERROR_EVENT_4 = 304
+    ERROR_EVENT_5 = 305
+    ERROR_EVENT_6 = 306
+    ERROR_EVENT_7 = 307
+    ERROR_EVENT_8 = 308
+
+    ERROR_EXPORT_1 = 201
+
+    ERROR_RATE_LIMIT_1 = 601
+
+    ERROR_REQUEST_1 = 401
+    ERROR_REQUEST_2 = 402
+    ERROR_REQUEST_3 = 403
+    ERROR_REQUEST_4 = 404
 
     ERROR_STUDIO_1 = 1
     ERROR_STUDIO_2 = 2
@@ -19,15 +46,48 @@ class ErrorCode(IntEnum):
     ERROR_STUDIO_4 = 4
     ERROR_STUDIO_5 = 5
     ERROR_STUDIO_6 = 6
+    ERROR_STUDIO_7 = 7
+    ERROR_STUDIO_8 = 8
+    ERROR_STUDIO_9 = 9
+    ERROR_STUDIO_10 = 10
+    ERROR_STUDIO_11 = 11
+    ERROR_STUDIO_12 = 12
 
 
 class ErrorMessage(Enum):
     ROUTE_AUTH_0 = 'Unexpected error'
 
+    ERROR_AUTH_1 = 'Manager is not authenticated'
+    ERROR_AUTH_2 = 'Permission denied'
+    ERROR_AUTH_3 = 'Auth API parameters are not valid'
+    ERROR_AUTH_4 = 'Token is not valid'
+    ERROR_AUTH_5 = 'Login fail'
+
     ERROR_MANAGER_1 = 'Create manager API parameters are not valid'
     ERROR_MANAGER_2 = 'Create manager API fail'
     ERROR_MANAGER_3 = 'Invite manager API parameters are not valid'
     ERROR_MANAGER_4 = 'Invite manager API fail'
+    ERROR_MANAGER_5 = 'Bulk invite manager API parameters are not valid'
+    ERROR_MANAGER_6 = 'Bulk invite manager API fail'
+    ERROR_MANAGER_7 = 'Get manager studios fail'
+
+    ERROR_EVENT_1 = 'Search events API parameters are not valid'
+    ERROR_EVENT_2 = 'Search events fail'
+    ERROR_EVENT_3 = 'Get events API parameters are not valid'
+    ERROR_EVENT_4 = 'Get events fail'
+    ERROR_EVENT_5 = 'Reserve event API parameters are not valid'
+    ERROR_EVENT_6 = 'Event is not exist'
+    ERROR_EVENT_7 = 'Event is sold out'
+    ERROR_EVENT_8 = 'Reserve event fail'
+
+    ERROR_EXPORT_1 = 'Export API parameters are not valid'
+
+    ERROR_RATE_LIMIT_1 = 'Too many requests'
+
+    ERROR_REQUEST_1 = 'Claim requests API parameters are not valid'
+    ERROR_REQUEST_2 = 'Claim requests fail'
+    ERROR_REQUEST_3 = 'Decide requests API parameters are not valid'
+    ERROR_REQUEST_4 = 'Decide requests fail'
 
     ERROR_STUDIO_1 = 'Create studio API parameters are not valid'
     ERROR_STUDIO_2 = 'Create studio fail'
@@ -35,15 +95,37 @@ class ErrorMessage(Enum):
     ERROR_STUDIO_4 = 'Patch social to studio API parameters are not valid'
     ERROR_STUDIO_5 = 'Studio is not exist'
     ERROR_STUDIO_6 = 'Patch social to studio fail'
+    ERROR_STUDIO_7 = 'Get studios API parameters are not valid'
+    ERROR_STUDIO_8 = 'Get studio fail'
+    ERROR_STUDIO_9 = 'Import studios API parameters are not valid'
+    ERROR_STUDIO_10 = 'Import studios fail'
+    ERROR_STUDIO_11 = 'Search studios API parameters are not valid'
+    ERROR_STUDIO_12 = 'Search studios fail'
 
 
 class SuccessMessage(Enum):
+    ROUTE_EVENT_1 = 'Search events success'
+    ROUTE_EVENT_2 = 'Get events success'
+    ROUTE_EVENT_3 = 'Reserve event success'
+
     ROUTE_MANAGER_1 = 'Create a manager, wait for approval'
     ROUTE_MANAGER_2 = 'Invite a manager, wait for activation'
+    ROUTE_MANAGER_3 = 'Invite managers, wait for activation'
+    ROUTE_MANAGER_4 = 'Get manager studios success'
+
+    ROUTE_TOKEN_1 = 'Login link sent if the manager exists'
+    ROUTE_TOKEN_2 = 'Issue tokens success'
+    ROUTE_TOKEN_3 = 'Logout success'
+
+    ROUTE_REQUEST_1 = 'Claim requests success'
+    ROUTE_REQUEST_2 = 'Decide requests success'
 
     ROUTE_AUTH_1 = 'Create studio success'
     ROUTE_AUTH_2 = 'Get studios success'
     ROUTE_AUTH_3 = 'Patch social to studio success'
+    ROUTE_AUTH_4 = 'Get studio success'
+    ROUTE_AUTH_5 = 'Import studios success'
+    ROUTE_AUTH_6 = 'Search studios success'
 
 
 class ResponseStatus(Enum):
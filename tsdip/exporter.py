@@ -0,0 +1,108 @@
+import csv
+import io
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+
+from tsdip import db
+from tsdip.models import Event, Studio
+from tsdip.serializer import column_names, dumps
+
+EXPORT_MODELS = {
+    'events': Event,
+    'studios': Studio,
+}
+FORMATS = ('csv', 'ndjson')
+
+
+def iter_rows(session, model, created_since=None, updated_since=None, chunk_size=1000):
+    """Yield rows from a server-side cursor, ``chunk_size`` at a time.
+
+    :param session: database session
+    :param model: model class from EXPORT_MODELS
+    :param created_since: only rows created at or after (Default value = None)
+    :param updated_since: only rows updated at or after (Default value = None)
+    :param chunk_size: rows fetched per round trip (Default value = 1000)
+    """
+    query = session.query(model).filter(model.deleted_at.is_(None))
+    if created_since:
+        query = query.filter(model.created_at >= created_since)
+    if updated_since:
+        query = query.filter(model.updated_at >= updated_since)
+
+    query = query.order_by(model.created_at, model.id) \
+        .execution_options(stream_results=True) \
+        .yield_per(chunk_size)
+
+    for row in query:
+        yield row.as_dict()
+        # Rows are never touched again, keep the identity map small
+        session.expunge(row)
+
+
+def iter_ndjson(rows):
+    """
+    :param rows: iterable of dicts
+    """
+    for row in rows:
+        yield dumps(row) + '\n'
+
+
+def iter_csv(rows, columns):
+    """
+    :param rows: iterable of dicts
+    :param columns: column names, used as header and field order
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        })
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export(session, name, fmt='ndjson', created_since=None, updated_since=None):
+    """Return a generator of NDJSON or CSV text chunks for one table.
+
+    :param session: database session
+    :param name: key of EXPORT_MODELS
+    :param fmt: 'ndjson' or 'csv' (Default value = 'ndjson')
+    :param created_since: (Default value = None)
+    :param updated_since: (Default value = None)
+    """
+    model = EXPORT_MODELS[name]
+    rows = iter_rows(
+        session,
+        model,
+        created_since=created_since,
+        updated_since=updated_since
+    )
+    if fmt == 'csv':
+        return iter_csv(rows, column_names(model))
+    return iter_ndjson(rows)
+
+
+@click.command('export')
+@click.argument('name', type=click.Choice(sorted(EXPORT_MODELS)))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default='ndjson')
+@click.option('--created-since', type=click.DateTime(), default=None)
+@click.option('--updated-since', type=click.DateTime(), default=None)
+@click.option('--output', type=click.File('w'), default='-')
+@with_appcontext
+def export_command(name, fmt, created_since, updated_since, output):
+    """Stream studios or events as NDJSON or CSV."""
+    for chunk in export(
+        db.session,
+        name,
+        fmt=fmt,
+        created_since=created_since,
+        updated_since=updated_since
+    ):
+        output.write(chunk)
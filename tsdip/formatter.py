@@ -1,13 +1,13 @@
-import json
 import traceback
 from http import HTTPStatus
 
 from flask import Response
 from flask import current_app as app
-from flask import jsonify, request
+from flask import request
 
 from tsdip.constants import (ErrorCode, ErrorMessage, ResponseStatus,
                              SuccessMessage)
+from tsdip.serializer import dumpb
 
 
 def format_response(fn):
@@ -34,7 +34,11 @@ def format_response(fn):
                 status = res['status']
 
                 response = format_success_response(code, status, data)
-                return jsonify(response), http_status_code
+                return Response(
+                    content_type="application/json",
+                    response=dumpb(response),
+                    status=http_status_code,
+                )
         else:
             response = format_error_message('ROUTE_AUTH_0')
             return Response(
@@ -46,6 +50,18 @@ def format_response(fn):
     return wrapper
 
 
+def debug_request():
+    """Request echoed in DEBUG responses.
+
+    Only JSON bodies are echoed. Streamed CSV or NDJSON uploads have been
+    consumed by then and must not be parsed again.
+    """
+    return {
+        'url': request.url,
+        'body': request.get_json(silent=True) if request.is_json else None,
+    }
+
+
 def format_error_message(code, status='ERROR', description=None):
     """
     :param code: Custom Error Code
@@ -65,11 +81,8 @@ def format_error_message(code, status='ERROR', description=None):
 
     if app.config['DEBUG']:
         res['traceback'] = traceback.format_exc()
-        res['request'] = {
-            'url': request.url,
-            'body': request.get_json(),
-        }
-    return json.dumps(res)
+        res['request'] = debug_request()
+    return dumpb(res)
 
 
 def format_success_response(code, status='SUCCESS', data={}):
@@ -87,9 +100,6 @@ def format_success_response(code, status='SUCCESS', data={}):
     }
 
     if app.config['DEBUG']:
-        res['request'] = {
-            'url': request.url,
-            'body': request.get_json(),
-        }
+        res['request'] = debug_request()
 
     return res
@@ -0,0 +1,140 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy.dialects.postgresql import insert
+
+from tsdip import cache, db
+from tsdip.models import Studio
+
+FORMATS = ('csv', 'ndjson')
+
+
+def iter_records(stream, fmt):
+    """Yield (line number, record) pairs without reading the whole stream.
+
+    :param stream: binary file-like object
+    :param fmt: 'csv' or 'ndjson'
+    """
+    lines = codecs.getreader('utf-8')(stream)
+
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except ValueError as err:
+            yield line_num, err
+
+
+def chunked(iterable, size):
+    """
+    :param iterable:
+    :param size: items per chunk
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_studios(session, records, chunk_size=1000, on_reject=None):
+    """Validate and insert studios chunk by chunk.
+
+    Each chunk is one INSERT ... ON CONFLICT DO NOTHING RETURNING and one
+    commit, so memory stays bounded by ``chunk_size`` and bad rows only
+    reject themselves.
+
+    :param session: database session
+    :param records: iterable of (line number, record) pairs
+    :param chunk_size: rows per INSERT (Default value = 1000)
+    :param on_reject: called with (line number, record, errors) (Default value = None)
+    """
+    from tsdip.routes.studio import StudioSchema
+
+    schema = StudioSchema()
+    inserted = rejected = 0
+
+    def reject(line_num, record, errors):
+        nonlocal rejected
+        rejected += 1
+        if on_reject:
+            on_reject(line_num, record, errors)
+
+    for chunk in chunked(records, chunk_size):
+        rows = {}
+        for line_num, record in chunk:
+            if isinstance(record, Exception):
+                reject(line_num, None, str(record))
+                continue
+            if not isinstance(record, dict):
+                reject(line_num, record, 'Record must be an object')
+                continue
+
+            errors = schema.validate(record)
+            if errors:
+                reject(line_num, record, errors)
+                continue
+            if record['name'] in rows:
+                reject(line_num, record, 'Duplicate name in file')
+                continue
+            rows[record['name']] = (line_num, {
+                'address': record['address'],
+                'name': record['name'],
+            })
+
+        if not rows:
+            continue
+
+        stmt = insert(Studio.__table__) \
+            .values([row for _, row in rows.values()]) \
+            .on_conflict_do_nothing(index_elements=['name']) \
+            .returning(Studio.name)
+        created = {row[0] for row in session.execute(stmt)}
+        session.commit()
+
+        inserted += len(created)
+        for name, (line_num, row) in rows.items():
+            if name not in created:
+                reject(line_num, row, 'Studio name already exists')
+
+    if inserted:
+        cache.invalidate('studios')
+    return inserted, rejected
+
+
+@click.command('import-studios')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default='csv')
+@click.option('--chunk-size', type=int, default=1000)
+@click.option('--reject-file', type=click.File('w'), default=None,
+              help='Write rejected rows as NDJSON to this file.')
+@with_appcontext
+def import_studios_command(source, fmt, chunk_size, reject_file):
+    """Import studios from a CSV or NDJSON file."""
+    def on_reject(line_num, record, errors):
+        if reject_file:
+            reject_file.write(json.dumps({
+                'errors': errors,
+                'line': line_num,
+                'record': record,
+            }, default=str) + '\n')
+
+    inserted, rejected = import_studios(
+        db.session,
+        iter_records(source, fmt),
+        chunk_size=chunk_size,
+        on_reject=on_reject
+    )
+    click.echo(f'Imported {inserted} studios, rejected {rejected}.')
@@ -0,0 +1,104 @@
+import json
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from tsdip import db
+
+# (description, statement, index the plan must use)
+HOT_QUERIES = (
+    (
+        'studio keyset page',
+        "SELECT * FROM studio WHERE deleted_at IS NULL "
+        "AND (name, id) < ('m', '00000000-0000-0000-0000-000000000000') "
+        "ORDER BY name DESC, id DESC LIMIT 11",
+        'ix_studio_live_name_id',
+    ),
+    (
+        'studio name trigram match',
+        "SELECT id FROM studio WHERE name % 'hip' "
+        "ORDER BY name <-> 'hip' LIMIT 500",
+        'ix_studio_name_trgm',
+    ),
+    (
+        'request log by target',
+        "SELECT * FROM request_log "
+        "WHERE request_id = '00000000-0000-0000-0000-000000000000'",
+        'ix_request_log_request_id',
+    ),
+    (
+        'pending request queue',
+        "SELECT * FROM request_log WHERE approve IS false "
+        "AND approve_at IS NULL AND request = 'manager' "
+        "ORDER BY created_at LIMIT 50 FOR UPDATE SKIP LOCKED",
+        'ix_request_log_pending',
+    ),
+    (
+        'studio permissions',
+        "SELECT * FROM permission "
+        "WHERE studio_id = '00000000-0000-0000-0000-000000000000'",
+        'ix_permission_studio_id',
+    ),
+    (
+        'manager by email',
+        "SELECT * FROM manager WHERE lower(email) = 'dancer@example.com'",
+        'ix_manager_email_lower',
+    ),
+    (
+        'events in start window',
+        "SELECT * FROM event WHERE deleted_at IS NULL "
+        "AND start_at IS NOT NULL AND start_at >= '2020-01-04' "
+        "AND start_at < '2020-01-06' ORDER BY start_at, id LIMIT 11",
+        'ix_event_live_start_at_id',
+    ),
+    (
+        'events with open registration',
+        "SELECT * FROM event WHERE deleted_at IS NULL "
+        "AND reg_end_at >= now() AND reg_start_at <= now()",
+        'ix_event_live_reg_window',
+    ),
+)
+
+
+def _plan_indexes(plan):
+    names = set()
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', ()):
+        names |= _plan_indexes(child)
+    return names
+
+
+def explain_hot_queries(session):
+    """Return (description, expected index, used indexes) for each hot query.
+
+    Sequential scans are disabled for the check so small development
+    tables still show which index the planner would pick.
+
+    :param session: database session
+    """
+    results = []
+    session.execute(text('SET LOCAL enable_seqscan = off'))
+    for description, statement, index in HOT_QUERIES:
+        plan = session.execute(text(f'EXPLAIN (FORMAT JSON) {statement}')).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        results.append((description, index, _plan_indexes(plan[0]['Plan'])))
+    session.rollback()
+    return results
+
+
+@click.command('check-indexes')
+@with_appcontext
+def check_indexes_command():
+    """Fail when a hot query stops using its index."""
+    failed = False
+    for description, index, used in explain_hot_queries(db.session):
+        ok = index in used
+        failed = failed or not ok
+        indexes = ', '.join(sorted(used)) or 'no index'
+        click.echo(f'{"ok" if ok else "FAIL":4} {description}: {indexes}')
+
+    if failed:
+        raise click.ClickException('Hot queries are not using their indexes.')
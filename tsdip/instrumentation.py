@@ -0,0 +1,105 @@
+import time
+
+from flask import g, request
+
+from tsdip.metrics import Histogram, registry
+
+enabled = False
+
+request_seconds = registry.register(Histogram(
+    'tsdip_request_seconds',
+    'Request latency by endpoint.',
+    labelnames=('endpoint', 'method', 'status'),
+))
+request_queries = registry.register(Histogram(
+    'tsdip_request_queries',
+    'Database queries issued per request.',
+    labelnames=('endpoint',),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+))
+request_db_seconds = registry.register(Histogram(
+    'tsdip_request_db_seconds',
+    'Time spent in database queries per request.',
+    labelnames=('endpoint',),
+))
+response_bytes = registry.register(Histogram(
+    'tsdip_response_bytes',
+    'Response body size by endpoint.',
+    labelnames=('endpoint',),
+    buckets=(100, 1000, 10000, 100000, 1000000, 10000000),
+))
+mail_seconds = registry.register(Histogram(
+    'tsdip_mail_send_seconds',
+    'Latency of outbound SendGrid requests.',
+    labelnames=('operation',),
+))
+
+
+def observe_mail(operation, seconds):
+    """
+    :param operation: 'send' or 'send_batch'
+    :param seconds: duration of the provider request
+    """
+    if enabled:
+        mail_seconds.observe(seconds, operation=operation)
+
+
+def observe_query(seconds):
+    """Add a statement to the current request, called by tsdip.queries.
+
+    :param seconds: duration of the statement
+    """
+    if enabled and 'request_started' in g:
+        g.db_queries += 1
+        g.db_seconds += seconds
+
+
+def _before_request():
+    g.request_started = time.perf_counter()
+    g.db_queries = 0
+    g.db_seconds = 0.0
+
+
+def _after_request(response):
+    if 'request_started' not in g:
+        return response
+
+    elapsed = time.perf_counter() - g.request_started
+    endpoint = request.endpoint or 'unmatched'
+
+    request_seconds.observe(
+        elapsed,
+        endpoint=endpoint,
+        method=request.method,
+        status=response.status_code
+    )
+    request_queries.observe(g.db_queries, endpoint=endpoint)
+    request_db_seconds.observe(g.db_seconds, endpoint=endpoint)
+    if response.content_length is not None:
+        response_bytes.observe(response.content_length, endpoint=endpoint)
+
+    response.headers['Server-Timing'] = (
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={g.db_seconds * 1000:.1f};desc="{g.db_queries} queries"'
+    )
+    return response
+
+
+def init_app(app):
+    """Hook request timing into ``app``.
+
+    Statements are timed by the cursor listeners in tsdip.queries, which
+    report through observe_query. Nothing is registered when
+    METRICS_ENABLED is off, so disabled instrumentation costs nothing per
+    request or per query.
+
+    :param app: Flask app
+    """
+    global enabled
+
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    enabled = True
+    app.before_request(_before_request)
+    app.after_request(_after_request)
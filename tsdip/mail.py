@@ -1,12 +1,38 @@
+import json
+import re
+import time
+from http import HTTPStatus
+
 from flask import current_app as app
 from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+from sendgrid.helpers.mail import Mail, Personalization, To
 
 from tsdip.constants import EmailTemplate
+from tsdip.instrumentation import observe_mail
+
+
+def rejected_personalizations(body):
+    """Map personalization index to error message from a SendGrid 400 body.
+
+    :param body: response body, JSON with an ``errors`` list
+    """
+    try:
+        errors = json.loads(body)['errors']
+    except (TypeError, ValueError, KeyError):
+        return {}
+
+    rejected = {}
+    for error in errors:
+        match = re.match(r'personalizations\.(\d+)', error.get('field') or '')
+        if match:
+            rejected.setdefault(int(match.group(1)), error.get('message'))
+    return rejected
 
 
 class SendGrid():
     api_key = app.config['SENDGRID_API_KEY']
+    # SendGrid accepts at most 1000 personalizations per request
+    batch_limit = 1000
     sender = app.config['SYSTEM_SENDER']
 
     def __init__(self):
@@ -21,6 +47,7 @@ class SendGrid():
         message.template_id = EmailTemplate[email_type].value
         message.dynamic_template_data = params
 
+        started = time.perf_counter()
         try:
             response = self.sg.send(message)
             res = {
@@ -35,5 +62,120 @@ class SendGrid():
                 'status': 'ERROR',
             }
         finally:
+            observe_mail('send', time.perf_counter() - started)
             app.logger.debug(f'sendgrid_send_result {res}')
             return res
+
+    def send_batch(self, recipients, email_type='SYSTEM'):
+        """Send one templated mail to many recipients in as few requests as possible.
+
+        SendGrid rejects a whole request when one personalization is
+        invalid. The addresses its errors point at are failed on their own
+        and the rest of the chunk is sent again, or one by one when the
+        errors do not say which addresses were rejected.
+
+        :param recipients: list of (email, dynamic_template_data) pairs
+        :param email_type: EmailTemplate name (Default value = 'SYSTEM')
+        :returns: dict of email to the result of the request it was sent in
+        """
+        results = {}
+        for start in range(0, len(recipients), self.batch_limit):
+            self._send_chunk(
+                recipients[start:start + self.batch_limit], email_type, results
+            )
+        return results
+
+    def _send_chunk(self, chunk, email_type, results):
+        message = Mail(from_email=self.sender)
+        for email, params in chunk:
+            personalization = Personalization()
+            personalization.add_to(To(email))
+            personalization.dynamic_template_data = params
+            message.add_personalization(personalization)
+        message.template_id = EmailTemplate[email_type].value
+
+        started = time.perf_counter()
+        rejected = None
+        try:
+            response = self.sg.send(message)
+            res = {
+                'body': response.body,
+                'headers': response.headers,
+                'status': response.status_code,
+            }
+        except Exception as err:
+            res = {
+                'code': 'ERROR_MANAGER_2',
+                'description': str(err),
+                'status': 'ERROR',
+            }
+            if getattr(err, 'status_code', None) == HTTPStatus.BAD_REQUEST:
+                rejected = rejected_personalizations(err.body)
+        observe_mail('send_batch', time.perf_counter() - started)
+        app.logger.debug(
+            f'sendgrid_send_batch_result {len(chunk)} recipients {res}'
+        )
+
+        if rejected is None or len(chunk) == 1:
+            for email, _ in chunk:
+                results[email] = res
+            return
+
+        rejected = {
+            index: description for index, description in rejected.items()
+            if index < len(chunk)
+        }
+        if not rejected:
+            for recipient in chunk:
+                self._send_chunk([recipient], email_type, results)
+            return
+
+        for index, description in rejected.items():
+            results[chunk[index][0]] = {
+                'code': 'ERROR_MANAGER_2',
+                'description': description,
+                'status': 'ERROR',
+            }
+        rest = [
+            recipient for index, recipient in enumerate(chunk)
+            if index not in rejected
+        ]
+        if rest:
+            self._send_chunk(rest, email_type, results)
+
+
+class MailSink():
+    """Local stand-in for SendGrid which records messages instead of sending."""
+
+    def __init__(self):
+        self.outbox = []
+
+    def send(self, to_emails, email_type='SYSTEM', params={}):
+        self.outbox.append({
+            'email_type': email_type,
+            'params': params,
+            'to_emails': to_emails,
+        })
+        app.logger.debug(f'mail_sink_send {to_emails}')
+        return {
+            'body': '',
+            'headers': {},
+            'status': 202,
+        }
+
+    def send_batch(self, recipients, email_type='SYSTEM'):
+        """
+        :param recipients: list of (email, dynamic_template_data) pairs
+        :param email_type: EmailTemplate name (Default value = 'SYSTEM')
+        """
+        return {
+            email: self.send(email, email_type, params)
+            for email, params in recipients
+        }
+
+
+def get_mailer():
+    """Build the mailer selected by MAIL_BACKEND, meant to be reused."""
+    if app.config.get('MAIL_BACKEND') == 'sink':
+        return MailSink()
+    return SendGrid()
@@ -1,8 +1,10 @@
-from sqlalchemy import CheckConstraint, func, text
-from sqlalchemy.dialects.postgresql import ENUM, TIMESTAMP, UUID
+from sqlalchemy import DDL, CheckConstraint, event, func, text
+from sqlalchemy.dialects.postgresql import (ENUM, JSONB, TIMESTAMP, TSVECTOR,
+                                            UUID)
 from sqlalchemy.orm import validates
 
 from tsdip import db
+from tsdip.serializer import row_to_dict
 
 
 class Base():
@@ -25,10 +27,41 @@ class Base():
     deleted_at = db.Column(TIMESTAMP)
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return row_to_dict(self)
+
+
+class MailOutbox(Base, db.Model):
+    __table_args__ = (
+        db.Index(
+            'ix_mail_outbox_pending',
+            'next_attempt_at',
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
+
+    to_email = db.Column(db.String(255), nullable=False)
+    email_type = db.Column(db.String(32), nullable=False, server_default='SYSTEM')
+    params = db.Column(JSONB, nullable=False, server_default='{}')
+    status = db.Column(
+        ENUM('pending', 'sent', 'failed', name='mail_status'),
+        nullable=False,
+        server_default='pending'
+    )
+    attempts = db.Column(db.Integer, nullable=False, server_default='0')
+    next_attempt_at = db.Column(
+        TIMESTAMP,
+        nullable=False,
+        server_default=func.current_timestamp()
+    )
+    sent_at = db.Column(TIMESTAMP)
+    last_error = db.Column(db.Text)
 
 
 class Social(Base, db.Model):
+    __table_args__ = (
+        db.Index('ix_social_email_lower', func.lower(text('email'))),
+    )
+
     email = db.Column(db.String(255), unique=True)
     fan_page = db.Column(db.String(255), unique=True)
     instagram = db.Column(db.String(255), unique=True)
@@ -43,6 +76,16 @@ class Social(Base, db.Model):
 
 
 class RequestLog(Base, db.Model):
+    __table_args__ = (
+        db.Index('ix_request_log_request_id', 'request_id'),
+        db.Index(
+            'ix_request_log_pending',
+            'request',
+            'created_at',
+            postgresql_where=text('approve IS false AND approve_at IS NULL')
+        ),
+    )
+
     request = db.Column(
         ENUM('studio', 'event', 'manager', name='request_type'),
         nullable=False,
@@ -56,7 +99,23 @@ class RequestLog(Base, db.Model):
         UUID(as_uuid=True),
         db.ForeignKey('manager.id', onupdate='CASCADE', ondelete='CASCADE')
     )
-    approver = db.relationship('Manager', uselist=False)
+    approver = db.relationship('Manager', uselist=False, foreign_keys=[approve_by])
+
+    # Lease taken by the operator reviewing the request, see tsdip.approval
+    claimed_by = db.Column(
+        UUID(as_uuid=True),
+        db.ForeignKey('manager.id', onupdate='CASCADE', ondelete='SET NULL')
+    )
+    claimed_until = db.Column(TIMESTAMP)
+
+
+class RevokedToken(Base, db.Model):
+    __table_args__ = (
+        db.Index('ix_revoked_token_expires_at', 'expires_at'),
+    )
+
+    jti = db.Column(db.String(32), nullable=False, unique=True)
+    expires_at = db.Column(TIMESTAMP, nullable=False)
 
 
 permission = db.Table(
@@ -96,11 +155,16 @@ permission = db.Table(
     db.Column(
         'deleted_at',
         TIMESTAMP
-    )
+    ),
+    db.Index('ix_permission_studio_id', 'studio_id')
 )
 
 
 class Manager(Base, db.Model):
+    __table_args__ = (
+        db.Index('ix_manager_email_lower', func.lower(text('email'))),
+    )
+
     username = db.Column(db.String(255), nullable=False, unique=True)
     email = db.Column(db.String(255), nullable=False, unique=True)
     telephone = db.Column(db.String(20), unique=True)
@@ -117,8 +181,30 @@ class Manager(Base, db.Model):
 
 
 class Studio(Base, db.Model):
+    __table_args__ = (
+        db.Index(
+            'ix_studio_live_name_id',
+            text('name DESC'),
+            text('id DESC'),
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+        db.Index(
+            'ix_studio_search_vector',
+            'search_vector',
+            postgresql_using='gin'
+        ),
+        db.Index(
+            'ix_studio_name_trgm',
+            'name',
+            postgresql_using='gist',
+            postgresql_ops={'name': 'gist_trgm_ops'}
+        ),
+    )
+
     name = db.Column(db.String(255), nullable=False, unique=True)
     address = db.Column(db.String(255))
+    # Maintained by the studio_search_vector_update trigger
+    search_vector = db.deferred(db.Column(TSVECTOR, info={'internal': True}))
 
     social_id = db.Column(
         UUID(as_uuid=True),
@@ -131,6 +217,35 @@ class Event(Base, db.Model):
     __table_args__ = (
         CheckConstraint('amount > -1'),
         CheckConstraint('price > -1'),
+        db.Index(
+            'ix_event_live_start_at_id',
+            'start_at',
+            'id',
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+        db.Index(
+            'ix_event_live_reg_window',
+            'reg_end_at',
+            'reg_start_at',
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+        db.Index('ix_event_price', 'price'),
+        db.Index(
+            'ix_event_created_at_brin',
+            'created_at',
+            postgresql_using='brin'
+        ),
+        db.Index(
+            'ix_event_search_vector',
+            'search_vector',
+            postgresql_using='gin'
+        ),
+        db.Index(
+            'ix_event_name_trgm',
+            'name',
+            postgresql_using='gist',
+            postgresql_ops={'name': 'gist_trgm_ops'}
+        ),
     )
 
     name = db.Column(db.String(255), nullable=False, unique=True)
@@ -142,9 +257,30 @@ class Event(Base, db.Model):
     reg_end_at = db.Column(TIMESTAMP)
     start_at = db.Column(TIMESTAMP)
     end_at = db.Column(TIMESTAMP)
+    # Maintained by the event_search_vector_update trigger
+    search_vector = db.deferred(db.Column(TSVECTOR, info={'internal': True}))
 
     social_id = db.Column(
         UUID(as_uuid=True),
         db.ForeignKey('social.id', onupdate='CASCADE', ondelete='CASCADE')
     )
     social = db.relationship('Social', uselist=False)
+
+
+SEARCH_TRIGGER = """
+CREATE TRIGGER {table}_search_vector_update
+BEFORE INSERT OR UPDATE OF {columns} ON {table}
+FOR EACH ROW EXECUTE PROCEDURE
+tsvector_update_trigger(search_vector, 'pg_catalog.simple', {columns})
+"""
+
+event.listen(
+    Studio.__table__,
+    'after_create',
+    DDL(SEARCH_TRIGGER.format(table='studio', columns='name, address'))
+)
+event.listen(
+    Event.__table__,
+    'after_create',
+    DDL(SEARCH_TRIGGER.format(table='event', columns='name, description'))
+)
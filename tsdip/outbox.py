@@ -0,0 +1,136 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import click
+from flask import current_app as app
+from flask.cli import with_appcontext
+from sqlalchemy import func
+
+from tsdip import db
+from tsdip.models import MailOutbox
+
+
+def enqueue(session, to_email, email_type='SYSTEM', params={}):
+    """Add a mail to the outbox, committed together with the caller's work.
+
+    :param session: database session of the current transaction
+    :param to_email: recipient address
+    :param email_type: EmailTemplate name (Default value = 'SYSTEM')
+    :param params: dynamic template data (Default value = {})
+    """
+    row = MailOutbox(
+        to_email=to_email,
+        email_type=email_type,
+        params=params
+    )
+    session.add(row)
+    return row
+
+
+def is_sent(res):
+    """
+    :param res: result dict returned by a mailer's send
+    """
+    status = res.get('status')
+    return status != 'ERROR' and int(status) < 400
+
+
+def drain(session, mailer, batch_size=100, max_attempts=5, backoff=30, workers=4):
+    """Send one batch of due outbox mails and record the outcome.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED so several workers can
+    drain the same outbox, and mails sharing a template go out through
+    ``send_batch`` as one request per provider batch. Failures are retried
+    with exponential backoff until ``max_attempts`` is reached.
+
+    :param session: database session
+    :param mailer: object with a SendGrid compatible ``send_batch``
+    :param batch_size: rows claimed per call (Default value = 100)
+    :param max_attempts: attempts before a mail is failed (Default value = 5)
+    :param backoff: base retry delay in seconds (Default value = 30)
+    :param workers: templates sent concurrently (Default value = 4)
+    """
+    rows = session.query(MailOutbox) \
+        .filter(
+            MailOutbox.status == 'pending',
+            MailOutbox.next_attempt_at <= func.current_timestamp()
+        ) \
+        .order_by(MailOutbox.next_attempt_at) \
+        .limit(batch_size) \
+        .with_for_update(skip_locked=True) \
+        .all()
+
+    if not rows:
+        session.commit()
+        return 0, 0
+
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.email_type, []).append(row)
+
+    # Executor threads do not inherit the app context the mailers log through
+    flask_app = app._get_current_object()
+
+    def send(email_type):
+        recipients = [(row.to_email, row.params) for row in groups[email_type]]
+        with flask_app.app_context():
+            return mailer.send_batch(recipients, email_type)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for email_type, res in zip(groups, executor.map(send, groups)):
+            results[email_type] = res
+
+    sent = failed = 0
+    for row in rows:
+        res = results[row.email_type][row.to_email]
+        row.attempts += 1
+        if is_sent(res):
+            row.status = 'sent'
+            row.sent_at = func.current_timestamp()
+            row.last_error = None
+            sent += 1
+            continue
+
+        row.last_error = str(res.get('description', res))
+        if row.attempts >= max_attempts:
+            row.status = 'failed'
+        else:
+            delay = timedelta(seconds=backoff * 2 ** (row.attempts - 1))
+            row.next_attempt_at = func.current_timestamp() + delay
+        failed += 1
+
+    session.commit()
+    return sent, failed
+
+
+@click.command('drain-outbox')
+@click.option('--batch-size', type=int, default=None)
+@click.option('--workers', type=int, default=4)
+@click.option('--loop', is_flag=True, help='Keep polling instead of exiting.')
+@click.option('--interval', type=float, default=1.0)
+@with_appcontext
+def drain_outbox_command(batch_size, workers, loop, interval):
+    """Send pending mails from the outbox."""
+    from tsdip.mail import get_mailer
+
+    mailer = get_mailer()
+    batch_size = batch_size or app.config['OUTBOX_BATCH_SIZE']
+
+    while True:
+        sent, failed = drain(
+            db.session,
+            mailer,
+            batch_size=batch_size,
+            max_attempts=app.config['OUTBOX_MAX_ATTEMPTS'],
+            backoff=app.config['OUTBOX_BACKOFF'],
+            workers=workers
+        )
+        if sent or failed:
+            click.echo(f'Sent {sent} mails, {failed} failed.')
+
+        if not loop:
+            break
+        if sent + failed < batch_size:
+            time.sleep(interval)
@@ -0,0 +1,88 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import literal, tuple_, types
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class CursorError(Exception):
+    """Raised when a client supplies a cursor token we did not issue."""
+
+
+def encode_cursor(values):
+    """
+    :param values: keyset values of the last row on the page
+    """
+    raw = json.dumps([str(value) for value in values]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    """
+    :param token: opaque cursor token from a previous response
+    :param size: number of keyset columns expected in the token
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError) as err:
+        raise CursorError(f'Cursor {token} is not valid') from err
+
+    if not isinstance(values, list) or len(values) != size:
+        raise CursorError(f'Cursor {token} is not valid')
+    return values
+
+
+def _coerce(column, value):
+    if isinstance(column.type, UUID):
+        return uuid.UUID(value)
+    if isinstance(column.type, types.DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def keyset_paginate(query, columns, cursor=None, limit=10, descending=True):
+    """Fetch one page with a single range query ordered by ``columns``.
+
+    The last column must be the primary key so the ordering is total, and
+    none of the columns may be NULL.
+
+    :param query: base query, already filtered
+    :param columns: keyset columns, e.g. (Studio.name, Studio.id)
+    :param cursor: opaque token returned as ``next_cursor`` (Default value = None)
+    :param limit: page size (Default value = 10)
+    :param descending: sort direction of every column (Default value = True)
+    """
+    if limit < 1:
+        raise ValueError(f'Page size must be positive, got {limit}')
+
+    if cursor:
+        values = decode_cursor(cursor, len(columns))
+        try:
+            bound = [
+                literal(_coerce(column, value), column.type)
+                for column, value in zip(columns, values)
+            ]
+        except (TypeError, ValueError) as err:
+            raise CursorError(f'Cursor {cursor} is not valid') from err
+
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple_(*bound))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*bound))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order) \
+        .limit(limit + 1) \
+        .all()
+
+    next_cursor = None
+    if rows and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [getattr(last, column.key) for column in columns]
+        )
+    return rows, next_cursor
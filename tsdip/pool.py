@@ -0,0 +1,84 @@
+import time
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+from tsdip.metrics import Counter, Gauge, Histogram, registry
+
+_pools = weakref.WeakSet()
+
+checkout_seconds = registry.register(Histogram(
+    'tsdip_db_pool_checkout_seconds',
+    'Time spent waiting for a pooled connection.',
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+))
+connections_opened = registry.register(Counter(
+    'tsdip_db_connections_opened_total',
+    'New DBAPI connections opened by the pool.',
+))
+connections_closed = registry.register(Counter(
+    'tsdip_db_connections_closed_total',
+    'DBAPI connections closed by the pool.',
+))
+registry.register(Gauge(
+    'tsdip_db_pool_checked_out',
+    'Connections currently checked out of the pool.',
+    lambda: sum(pool.checkedout() for pool in list(_pools)),
+))
+registry.register(Gauge(
+    'tsdip_db_pool_overflow',
+    'Connections open beyond pool_size.',
+    lambda: sum(max(pool.overflow(), 0) for pool in list(_pools)),
+))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _pools.add(self)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            checkout_seconds.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Pool, 'connect')
+def _on_connect(dbapi_connection, connection_record):
+    connections_opened.inc()
+
+
+@event.listens_for(Pool, 'close')
+def _on_close(dbapi_connection, connection_record):
+    connections_closed.inc()
+
+
+def engine_options(app):
+    """SQLALCHEMY_ENGINE_OPTIONS for the pooling mode of ``app``.
+
+    With DB_POOLER = 'external' an external transaction pooler such as
+    PgBouncer owns the connections, so SQLAlchemy opens one per checkout
+    and does not keep server-side prepared statements around.
+
+    :param app: Flask app
+    """
+    options = dict(app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+
+    if app.config.get('DB_POOLER') == 'external':
+        for key in ('max_overflow', 'pool_recycle', 'pool_size', 'pool_timeout'):
+            options.pop(key, None)
+        options['poolclass'] = NullPool
+        options['pool_pre_ping'] = False
+
+        if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql+psycopg:'):
+            connect_args = dict(options.get('connect_args', {}))
+            connect_args['prepare_threshold'] = None
+            options['connect_args'] = connect_args
+    else:
+        options['poolclass'] = InstrumentedQueuePool
+    return options
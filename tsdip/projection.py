@@ -0,0 +1,75 @@
+from tsdip.serializer import column_names
+
+
+class ProjectionError(Exception):
+    """Raised when a ``fields`` parameter names an unknown column."""
+
+
+def parse_fields(model, value):
+    """Parse a comma separated ``fields`` parameter into column names.
+
+    :param model: model class the fields belong to
+    :param value: e.g. 'name,address'
+    """
+    names = []
+    for name in value.split(','):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+
+    columns = column_names(model)
+    unknown = [name for name in names if name not in columns]
+    if unknown or not names:
+        raise ProjectionError(f'Fields {", ".join(unknown)} are not valid')
+    return names
+
+
+def select_columns(model, names, required=()):
+    """Column attributes to SELECT, the requested ones plus ``required``.
+
+    :param model: model class
+    :param names: column names from parse_fields
+    :param required: columns the query itself needs, e.g. keyset columns (Default value = ())
+    """
+    return [
+        getattr(model, name)
+        for name in list(names) + [name for name in required if name not in names]
+    ]
+
+
+def row_subset(row, names):
+    """
+    :param row: result row of a column query
+    :param names: column names to serialize
+    """
+    return {name: getattr(row, name) for name in names}
+
+
+def parse_include(value, allowed=('social',)):
+    """Parse a comma separated ``include`` parameter into relation names.
+
+    :param value: e.g. 'social'
+    :param allowed: relations the endpoint can embed (Default value = ('social',))
+    """
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise ProjectionError(f'Include {", ".join(sorted(unknown))} are not valid')
+    return names
+
+
+def load_socials(session, social_ids):
+    """Fetch Social rows for a page of column rows with one IN query.
+
+    :param session: database session
+    :param social_ids: Social ids referenced by the page, None is skipped
+    """
+    from tsdip.models import Social
+
+    social_ids = {social_id for social_id in social_ids if social_id}
+    if not social_ids:
+        return {}
+    return {
+        social.id: social.as_dict()
+        for social in session.query(Social).filter(Social.id.in_(social_ids))
+    }
@@ -0,0 +1,109 @@
+import logging
+import time
+from functools import wraps
+
+from flask import current_app as app
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from tsdip import instrumentation
+from tsdip.metrics import Counter, registry
+
+logger = logging.getLogger('tsdip.slow_query')
+
+slow_queries = registry.register(Counter(
+    'tsdip_slow_queries_total',
+    'Statements slower than SLOW_QUERY_THRESHOLD_MS.',
+    labelnames=('endpoint',),
+))
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in test mode when a route issues more queries than budgeted."""
+
+
+def parameter_shape(parameters, executemany=False):
+    """Describe bound parameters by type only, values never reach the log.
+
+    :param parameters: DBAPI parameters of one statement
+    :param executemany: parameters is a sequence of parameter sets (Default value = False)
+    """
+    if executemany:
+        if not parameters:
+            return []
+        return {'rows': len(parameters), 'row': parameter_shape(parameters[0])}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def init_app(app, engine):
+    """Time every statement once for metrics, slow query logs and budgets.
+
+    Call it after ``instrumentation.init_app``, this is the only cursor
+    listener pair and it feeds the per-request query metrics too.
+
+    :param app: Flask app
+    :param engine: SQLAlchemy engine used by the app
+    """
+    threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    enforce_budget = app.config.get('QUERY_BUDGET_ENFORCED')
+    if threshold is None and not enforce_budget and not instrumentation.enabled:
+        return
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._tsdip_query_started = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._tsdip_query_started
+        in_request = has_request_context()
+        if in_request:
+            instrumentation.observe_query(elapsed)
+            if enforce_budget and 'query_budget_used' in g:
+                g.query_budget_used += 1
+
+        if threshold is None or elapsed * 1000 < threshold:
+            return
+
+        endpoint = request.endpoint if in_request else None
+        slow_queries.inc(endpoint=endpoint or 'none')
+        logger.warning(
+            'slow query %.1fms endpoint=%s statement=%s parameters=%s',
+            elapsed * 1000,
+            endpoint,
+            statement,
+            parameter_shape(parameters, executemany),
+        )
+
+
+def query_budget(limit):
+    """Fail the request in test mode when the route runs more than ``limit`` queries.
+
+    Only active with QUERY_BUDGET_ENFORCED, otherwise it adds a single
+    config lookup per call. Apply it below ``format_response``.
+
+    :param limit: maximum number of statements the route may execute
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not app.config.get('QUERY_BUDGET_ENFORCED'):
+                return fn(*args, **kwargs)
+
+            g.query_budget_used = 0
+            try:
+                res = fn(*args, **kwargs)
+            finally:
+                used = g.pop('query_budget_used')
+
+            if used > limit:
+                raise QueryBudgetExceeded(
+                    f'{request.endpoint} ran {used} queries, budget is {limit}'
+                )
+            return res
+        return wrapper
+    return decorator
@@ -0,0 +1,173 @@
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from http import HTTPStatus
+
+from flask import Response, g, request
+
+from tsdip.formatter import format_error_message
+from tsdip.metrics import Counter, registry
+
+rate_limited = registry.register(Counter(
+    'tsdip_rate_limited_total',
+    'Requests rejected with 429 by the rate limiter.',
+    labelnames=('blueprint',),
+))
+
+# Reads are cheap and cached, only writes spend tokens
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+class RateLimitBackend():
+    """Token bucket store shared by the requests it limits."""
+
+    def take(self, key, capacity, rate, cost=1):
+        """Spend ``cost`` tokens from the bucket at ``key`` if it has them.
+
+        :param key: bucket key
+        :param capacity: bucket size, the allowed burst
+        :param rate: tokens added per second
+        :param cost: tokens to spend (Default value = 1)
+        :returns: (allowed, seconds until ``cost`` tokens are available)
+        """
+        raise NotImplementedError
+
+
+class MemoryBuckets(RateLimitBackend):
+    """In-process buckets, one per worker.
+
+    Keys are spread over striped locks so requests of different clients
+    rarely wait on each other. Each stripe is an LRU, an evicted bucket
+    simply starts full again.
+    """
+
+    def __init__(self, threshold=100000, stripes=64, clock=time.monotonic):
+        self.clock = clock
+        self.stripes = stripes
+        self.stripe_size = max(1, threshold // stripes)
+        self._buckets = [OrderedDict() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def take(self, key, capacity, rate, cost=1):
+        index = zlib.crc32(key.encode('utf-8')) % self.stripes
+        buckets = self._buckets[index]
+        now = self.clock()
+
+        with self._locks[index]:
+            tokens, updated_at = buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            if len(buckets) > self.stripe_size:
+                buckets.popitem(last=False)
+
+        return allowed, 0 if allowed else (cost - tokens) / rate
+
+
+class RedisBuckets(RateLimitBackend):
+    """Buckets shared by every worker, updated atomically by a Lua script."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, client, prefix='tsdip:ratelimit:'):
+        self.prefix = prefix
+        self.script = client.register_script(self.SCRIPT)
+
+    def take(self, key, capacity, rate, cost=1):
+        allowed, tokens = self.script(
+            keys=[self.prefix + key],
+            args=[capacity, rate, time.time(), cost]
+        )
+        if allowed:
+            return True, 0
+        return False, (cost - float(tokens)) / rate
+
+
+class RateLimiter():
+    """Per-client token buckets for the blueprints listed in RATELIMIT_LIMITS.
+
+    Clients are keyed by manager id when the request carries a valid
+    access token and by remote address otherwise.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBuckets()
+        self.limits = {}
+
+    def init_app(self, app):
+        """Register the limit check, after authentication, instrumentation
+        and the access log have registered theirs.
+
+        :param app: Flask app
+        """
+        if not app.config.get('RATELIMIT_ENABLED'):
+            return
+
+        if app.config.get('RATELIMIT_BACKEND', 'memory') == 'redis':
+            import redis
+            self.backend = RedisBuckets(
+                redis.Redis.from_url(app.config['RATELIMIT_REDIS_URL'])
+            )
+        else:
+            self.backend = MemoryBuckets(
+                threshold=app.config.get('RATELIMIT_THRESHOLD', 100000)
+            )
+
+        # (requests, seconds) becomes a bucket of that size refilled evenly
+        self.limits = {
+            blueprint: (requests, requests / seconds)
+            for blueprint, (requests, seconds)
+            in app.config.get('RATELIMIT_LIMITS', {}).items()
+        }
+        app.before_request(self._check)
+
+    def client_key(self):
+        manager_id = g.get('manager_id')
+        if manager_id is not None:
+            return f'manager:{manager_id}'
+        return f'ip:{request.remote_addr}'
+
+    def _check(self):
+        if request.method in SAFE_METHODS:
+            return None
+        limit = self.limits.get(request.blueprint)
+        if limit is None:
+            return None
+
+        capacity, rate = limit
+        allowed, retry_after = self.backend.take(
+            f'{request.blueprint}:{self.client_key()}', capacity, rate
+        )
+        if allowed:
+            return None
+
+        rate_limited.inc(blueprint=request.blueprint)
+        return Response(
+            content_type='application/json',
+            headers={'Retry-After': str(max(1, math.ceil(retry_after)))},
+            response=format_error_message('ERROR_RATE_LIMIT_1'),
+            status=HTTPStatus.TOO_MANY_REQUESTS,
+        )
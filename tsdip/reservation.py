@@ -0,0 +1,45 @@
+from sqlalchemy import update
+
+from tsdip.models import Event
+
+
+class EventNotFound(Exception):
+    """Raised when the event does not exist or was deleted."""
+
+
+class SoldOut(Exception):
+    """Raised when fewer seats are left than requested."""
+
+
+def reserve_seats(session, event_id, quantity=1):
+    """Take ``quantity`` seats with one conditional UPDATE ... RETURNING.
+
+    Concurrent callers queue on the row instead of reading, checking and
+    writing back a stale amount. The UPDATE keeps the row locked until the
+    transaction ends, so the session is committed right after it and
+    rolled back when no seat was taken. Call it in a transaction of its
+    own.
+
+    :param session: database session
+    :param event_id: Event id
+    :param quantity: seats to take (Default value = 1)
+    :returns: seats left after the reservation
+    """
+    stmt = update(Event.__table__) \
+        .where(Event.__table__.c.id == event_id) \
+        .where(Event.__table__.c.deleted_at.is_(None)) \
+        .where(Event.__table__.c.amount >= quantity) \
+        .values(amount=Event.__table__.c.amount - quantity) \
+        .returning(Event.__table__.c.amount)
+    remaining = session.execute(stmt).scalar()
+    if remaining is not None:
+        session.commit()
+        return remaining
+
+    session.rollback()
+    exists = session.query(Event.id) \
+        .filter(Event.id == event_id, Event.deleted_at.is_(None)) \
+        .scalar()
+    if exists is None:
+        raise EventNotFound(f'Event {event_id} is not exist')
+    raise SoldOut(f'Event {event_id} has fewer than {quantity} seats left')
@@ -0,0 +1,217 @@
+from http import HTTPStatus
+
+from flask import Blueprint
+from flask import current_app as app
+from flask import g, request
+from marshmallow import Schema, ValidationError, fields
+from sqlalchemy import func
+
+from tsdip import tokens
+from tsdip.authentication import TokenError
+from tsdip.formatter import format_response
+from tsdip.models import Manager, RequestLog
+from tsdip.outbox import enqueue
+from tsdip.queries import query_budget
+
+api_blueprint = Blueprint('auth', __name__, url_prefix='/auth')
+
+
+class LoginSchema(Schema):
+    email = fields.Email(required=True)
+
+
+class TokenSchema(Schema):
+    token = fields.Str(required=True)
+
+
+def load_token(kind):
+    """Validate the request body and verify its token.
+
+    :param kind: expected token type
+    :returns: (claims, None) or (None, error response)
+    """
+    try:
+        data = TokenSchema().load(request.get_json())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return None, {
+            'code': 'ERROR_AUTH_3',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        return tokens.verify(data['token'], kind), None
+    except TokenError as err:
+        return None, {
+            'code': 'ERROR_AUTH_4',
+            'description': str(err),
+            'http_status_code': HTTPStatus.UNAUTHORIZED,
+            'status': 'ERROR',
+        }
+
+
+def find_active_manager(session, *criteria):
+    """Return the live manager matching ``criteria`` who may log in.
+
+    Managers who signed up themselves wait for approval, rejected ones
+    never get in.
+
+    :param session: database session
+    :param criteria: filters on Manager
+    """
+    unapproved = session.query(RequestLog).filter(
+        RequestLog.request == 'manager',
+        RequestLog.request_id == Manager.id,
+        RequestLog.approve.is_(False)
+    ).exists()
+    return session.query(Manager) \
+        .filter(Manager.deleted_at.is_(None), ~unapproved, *criteria) \
+        .one_or_none()
+
+
+def issue_for(claims):
+    """Revoke a login or refresh token and issue a new pair.
+
+    The manager is reloaded, so deleted or rejected managers cannot keep
+    their session alive, and a token traded in twice, even on different
+    workers, only works once.
+
+    :param claims: payload of the token being traded in
+    """
+    try:
+        manager = find_active_manager(g.db_session, Manager.id == claims['sub'])
+        consumed = manager is not None and tokens.consume(g.db_session, claims)
+        g.db_session.commit()
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+        return {
+            'code': 'ERROR_AUTH_5',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    if manager is None:
+        return {
+            'code': 'ERROR_AUTH_4',
+            'description': 'Manager is not active',
+            'http_status_code': HTTPStatus.UNAUTHORIZED,
+            'status': 'ERROR',
+        }
+
+    if not consumed:
+        return {
+            'code': 'ERROR_AUTH_4',
+            'description': 'Token has been revoked',
+            'http_status_code': HTTPStatus.UNAUTHORIZED,
+            'status': 'ERROR',
+        }
+
+    return {
+        'code': 'ROUTE_TOKEN_2',
+        'data': tokens.issue_pair(claims['sub']),
+        'http_status_code': HTTPStatus.OK,
+        'status': 'SUCCESS',
+    }
+
+
+@api_blueprint.route('/login', methods=['POST'])
+@format_response
+@query_budget(2)
+def login():
+    """Mail a single use login link to an approved manager.
+
+    The response is the same whether or not the email belongs to a
+    manager, so it cannot be used to probe for accounts.
+    """
+    try:
+        data = LoginSchema().load(request.get_json())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_AUTH_3',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        manager = find_active_manager(
+            g.db_session,
+            func.lower(Manager.email) == data['email'].lower()
+        )
+        if manager is not None:
+            token = tokens.issue(manager.id, 'login', tokens.login_ttl)
+            enqueue(g.db_session, manager.email, params={
+                'url': f'{app.config["AUTH_LOGIN_URL"]}?token={token}',
+            })
+        g.db_session.commit()
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_AUTH_5',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_TOKEN_1',
+            'http_status_code': HTTPStatus.ACCEPTED,
+            'status': 'SUCCESS',
+        }
+
+
+@api_blueprint.route('/token', methods=['POST'])
+@format_response
+@query_budget(2)
+def exchange():
+    """Trade a login token for an access and refresh token."""
+    claims, error = load_token('login')
+    if error:
+        return error
+    return issue_for(claims)
+
+
+@api_blueprint.route('/refresh', methods=['POST'])
+@format_response
+@query_budget(2)
+def refresh():
+    """Rotate a refresh token, the old one is revoked."""
+    claims, error = load_token('refresh')
+    if error:
+        return error
+    return issue_for(claims)
+
+
+@api_blueprint.route('/logout', methods=['POST'])
+@format_response
+@query_budget(1)
+def logout():
+    claims, error = load_token('refresh')
+    if error:
+        return error
+
+    try:
+        tokens.consume(g.db_session, claims)
+        g.db_session.commit()
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+        return {
+            'code': 'ERROR_AUTH_5',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    return {
+        'code': 'ROUTE_TOKEN_3',
+        'http_status_code': HTTPStatus.OK,
+        'status': 'SUCCESS',
+    }
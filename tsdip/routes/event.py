@@ -0,0 +1,232 @@
+from http import HTTPStatus
+
+from flask import Blueprint
+from flask import current_app as app
+from flask import g, request
+from marshmallow import Schema, ValidationError, fields, validate
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+
+from tsdip import cache, tokens
+from tsdip.formatter import format_response
+from tsdip.models import Event
+from tsdip.pagination import CursorError, keyset_paginate
+from tsdip.projection import ProjectionError, parse_include
+from tsdip.queries import query_budget
+from tsdip.reservation import EventNotFound, SoldOut, reserve_seats
+from tsdip.search import SearchSchema, search
+
+api_blueprint = Blueprint('events', __name__, url_prefix='/events')
+
+
+class EventListSchema(Schema):
+    registration = fields.Str(validate=validate.OneOf(['open']))
+    start_from = fields.DateTime()
+    start_to = fields.DateTime()
+    min_price = fields.Int(validate=validate.Range(min=0))
+    max_price = fields.Int(validate=validate.Range(min=0))
+    limit = fields.Int(validate=validate.Range(min=1, max=50))
+    cursor = fields.Str()
+    include = fields.Str()
+
+
+def serialize_event(event, include=()):
+    """
+    :param event: Event instance
+    :param include: relations to embed (Default value = ())
+    """
+    res = event.as_dict()
+    if 'social' in include:
+        res['social'] = event.social.as_dict() if event.social else None
+    return res
+
+
+@api_blueprint.route('', methods=['GET'])
+@format_response
+@query_budget(2)
+@cache.cached('events')
+def get_list():
+    """List upcoming events in start order, one keyset range query per page.
+
+    registration=open keeps events whose registration window contains
+    now, start_from/start_to bound start_at and min_price/max_price
+    bound price. start_from defaults to now, so past events are left out
+    unless asked for.
+    """
+    try:
+        params = EventListSchema().load(request.args.to_dict())
+        include = parse_include(params.get('include', ''))
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_EVENT_3',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    except ProjectionError as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_EVENT_3',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    query = g.db_session.query(Event) \
+        .filter(Event.deleted_at.is_(None), Event.start_at.isnot(None))
+
+    now = func.current_timestamp()
+    if params.get('registration') == 'open':
+        query = query.filter(Event.reg_end_at >= now, Event.reg_start_at <= now)
+    query = query.filter(Event.start_at >= params.get('start_from', now))
+    if 'start_to' in params:
+        query = query.filter(Event.start_at < params['start_to'])
+    if 'min_price' in params:
+        query = query.filter(Event.price >= params['min_price'])
+    if 'max_price' in params:
+        query = query.filter(Event.price <= params['max_price'])
+    if 'social' in include:
+        query = query.options(selectinload(Event.social))
+
+    try:
+        rows, next_cursor = keyset_paginate(
+            query,
+            (Event.start_at, Event.id),
+            cursor=params.get('cursor'),
+            limit=params.get('limit', 10),
+            descending=False
+        )
+        items = [serialize_event(row, include) for row in rows]
+    except CursorError as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_EVENT_3',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_EVENT_4',
+            'description': str(err),
+            'http_status_code': HTTPStatus.INTERNAL_SERVER_ERROR,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_EVENT_2',
+            'data': {
+                'items': items,
+                'next_cursor': next_cursor,
+            },
+            'http_status_code': HTTPStatus.OK,
+            'status': 'SUCCESS',
+        }
+
+
+@api_blueprint.route('/search', methods=['GET'])
+@format_response
+@query_budget(1)
+@cache.cached('events')
+def search_list():
+    try:
+        params = SearchSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_EVENT_1',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        result = search(
+            g.db_session,
+            Event,
+            params['q'],
+            limit=params.get('limit', 10)
+        )
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_EVENT_2',
+            'description': str(err),
+            'http_status_code': HTTPStatus.INTERNAL_SERVER_ERROR,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_EVENT_1',
+            'data': result,
+            'http_status_code': HTTPStatus.OK,
+            'status': 'SUCCESS',
+        }
+
+
+class ReservationSchema(Schema):
+    quantity = fields.Int(required=True, validate=validate.Range(min=1, max=20))
+
+
+@api_blueprint.route('/<path:event_id>/reserve', methods=['POST'])
+@format_response
+@tokens.login_required
+@query_budget(2)
+def reserve(event_id):
+    # Cached listings keep their seat count until CACHE_DEFAULT_TIMEOUT,
+    # invalidating on every reservation would defeat the cache for hot events
+    try:
+        data = ReservationSchema().load(request.get_json())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_EVENT_5',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        remaining = reserve_seats(g.db_session, event_id, data['quantity'])
+    except EventNotFound as err:
+        g.db_session.rollback()
+        return {
+            'code': 'ERROR_EVENT_6',
+            'description': str(err),
+            'http_status_code': HTTPStatus.NOT_FOUND,
+            'status': 'ERROR',
+        }
+    except SoldOut as err:
+        g.db_session.rollback()
+        return {
+            'code': 'ERROR_EVENT_7',
+            'description': str(err),
+            'http_status_code': HTTPStatus.CONFLICT,
+            'status': 'ERROR',
+        }
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_EVENT_8',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_EVENT_3',
+            'data': {
+                'quantity': data['quantity'],
+                'remaining': remaining,
+            },
+            'http_status_code': HTTPStatus.CREATED,
+            'status': 'SUCCESS',
+        }
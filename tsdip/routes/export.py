@@ -0,0 +1,63 @@
+from datetime import datetime
+from http import HTTPStatus
+
+from flask import Blueprint, Response
+from flask import current_app as app
+from flask import g, request, stream_with_context
+
+from tsdip import permissions
+from tsdip.exporter import EXPORT_MODELS, FORMATS, export
+from tsdip.formatter import format_error_message
+
+api_blueprint = Blueprint('exports', __name__, url_prefix='/exports')
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+@api_blueprint.route('/<string:name>', methods=['GET'])
+def get_export(name):
+    if not permissions.is_admin(g.get('manager_id')):
+        return Response(
+            content_type="application/json",
+            response=format_error_message('ERROR_AUTH_2', description='admin is required'),
+            status=HTTPStatus.FORBIDDEN,
+        )
+
+    params = request.args.to_dict()
+    fmt = params.get('format', 'ndjson')
+
+    try:
+        if name not in EXPORT_MODELS:
+            raise ValueError(f'Export {name} is not exist')
+        if fmt not in FORMATS:
+            raise ValueError(f'Format must be one of {", ".join(FORMATS)}')
+
+        created_since = datetime.fromisoformat(params['created_since']) \
+            if 'created_since' in params else None
+        updated_since = datetime.fromisoformat(params['updated_since']) \
+            if 'updated_since' in params else None
+    except ValueError as err:
+        app.logger.error(err)
+        return Response(
+            content_type="application/json",
+            response=format_error_message('ERROR_EXPORT_1', description=str(err)),
+            status=HTTPStatus.BAD_REQUEST,
+        )
+
+    chunks = export(
+        g.db_session,
+        name,
+        fmt=fmt,
+        created_since=created_since,
+        updated_since=updated_since
+    )
+    return Response(
+        stream_with_context(chunks),
+        headers={
+            'Content-Disposition': f'attachment; filename={name}.{fmt}',
+        },
+        mimetype=MIMETYPES[fmt],
+    )
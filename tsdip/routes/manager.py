@@ -3,24 +3,38 @@ from http import HTTPStatus
 from flask import Blueprint
 from flask import current_app as app
 from flask import g, request
-from marshmallow import Schema, ValidationError, fields
-from sqlalchemy import or_
+from marshmallow import Schema, ValidationError, fields, validate
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import selectinload
 
+from tsdip import cache, permissions
 from tsdip.formatter import format_response
-from tsdip.mail import SendGrid
-from tsdip.models import Manager, RequestLog, Studio
+from tsdip.models import MailOutbox, Manager, RequestLog, Studio, permission
+from tsdip.outbox import enqueue
+from tsdip.projection import ProjectionError, parse_include
+from tsdip.queries import query_budget
+from tsdip.routes.studio import serialize_studio
 
 api_blueprint = Blueprint('managers', __name__, url_prefix='/managers')
 
 
 class ManagerSchema(Schema):
     username = fields.Str(required=True)
-    email = fields.Str(required=True)
+    email = fields.Email(required=True)
     telephone = fields.Str()
 
 
+class BulkManagerSchema(Schema):
+    managers = fields.List(
+        fields.Dict(),
+        required=True,
+        validate=validate.Length(min=1, max=1000)
+    )
+
+
 @api_blueprint.route('/signup', methods=['POST'])
 @format_response
+@query_budget(3)
 def create():
     try:
         ManagerSchema().load(request.get_json())
@@ -41,7 +55,7 @@ def create():
     try:
         exist_manager = g.db_session.query(Manager).filter(
             or_(
-                Manager.email == email,
+                func.lower(Manager.email) == email.lower(),
                 Manager.username == username
             )
         ).one_or_none()
@@ -81,6 +95,8 @@ def create():
 
 @api_blueprint.route('/invite/<path:studio_id>', methods=['POST'])
 @format_response
+@permissions.require_role('owner')
+@query_budget(6)
 def invite(studio_id):
     try:
         ManagerSchema().load(request.get_json())
@@ -107,7 +123,6 @@ def invite(studio_id):
             'status': 'ERROR',
         }
 
-    mail = SendGrid()
     data = request.get_json()
     email, username = data['email'], data['username']
     telephone = data['telephone'] if 'telephone' in data else None
@@ -115,7 +130,7 @@ def invite(studio_id):
     try:
         exist_manager = g.db_session.query(Manager).filter(
             or_(
-                Manager.email == email,
+                func.lower(Manager.email) == email.lower(),
                 Manager.username == username
             )
         ).one_or_none()
@@ -130,7 +145,10 @@ def invite(studio_id):
         g.db_session.add(manager)
         g.db_session.flush()
         manager.studios.append(studio)
+        enqueue(g.db_session, email)
         g.db_session.commit()
+        cache.invalidate('studios')
+        permissions.invalidate(manager.id)
     except Exception as err:
         app.logger.error(err)
         g.db_session.rollback()
@@ -142,9 +160,177 @@ def invite(studio_id):
             'status': 'ERROR',
         }
     else:
-        mail.send(email)
         return {
             'code': 'ROUTE_MANAGER_2',
             'http_status_code': HTTPStatus.CREATED,
             'status': 'SUCCESS',
         }
+
+
+@api_blueprint.route('/invite/<path:studio_id>/bulk', methods=['POST'])
+@format_response
+@permissions.require_role('owner')
+@query_budget(5)
+def bulk_invite(studio_id):
+    try:
+        BulkManagerSchema().load(request.get_json())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        app.logger.error(err.valid_data)
+        return {
+            'code': 'ERROR_MANAGER_5',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        studio = g.db_session.query(Studio).get(studio_id)
+        if studio is None:
+            raise Exception(f'Studio {studio_id} is not exist')
+    except Exception as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_MANAGER_5',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    schema = ManagerSchema()
+    results, candidates = [], []
+    for index, item in enumerate(request.get_json()['managers']):
+        errors = schema.validate(item)
+        if errors:
+            results.append({
+                'description': errors,
+                'index': index,
+                'status': 'error',
+            })
+            continue
+
+        results.append({
+            'email': item['email'],
+            'index': index,
+            'status': 'invited',
+        })
+        candidates.append((index, {
+            'email': item['email'].lower(),
+            'telephone': item.get('telephone'),
+            'username': item['username'],
+        }))
+
+    try:
+        emails = {row['email'] for _, row in candidates}
+        usernames = {row['username'] for _, row in candidates}
+        telephones = {row['telephone'] for _, row in candidates if row['telephone']}
+        taken = set()
+        for exist in g.db_session.query(
+            Manager.email, Manager.username, Manager.telephone
+        ).filter(
+            or_(
+                func.lower(Manager.email).in_(emails),
+                Manager.username.in_(usernames),
+                Manager.telephone.in_(telephones)
+            )
+        ):
+            taken.update(exist)
+
+        rows = []
+        for index, row in candidates:
+            keys = {row['email'], row['username'], row['telephone']} - {None}
+            if keys & taken:
+                results[index] = {
+                    'description': 'Username, email or telephone has been used',
+                    'email': row['email'],
+                    'index': index,
+                    'status': 'error',
+                }
+                continue
+            taken.update(keys)
+            rows.append(row)
+
+        if rows:
+            manager_ids = [row[0] for row in g.db_session.execute(
+                insert(Manager.__table__).values(rows).returning(Manager.id)
+            )]
+            g.db_session.execute(insert(permission).values([
+                {'manager_id': manager_id, 'studio_id': studio.id}
+                for manager_id in manager_ids
+            ]))
+            g.db_session.execute(insert(MailOutbox.__table__).values([
+                {'to_email': row['email']} for row in rows
+            ]))
+        g.db_session.commit()
+        cache.invalidate('studios')
+        if rows:
+            permissions.invalidate(*manager_ids)
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_MANAGER_6',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_MANAGER_3',
+            'data': results,
+            'http_status_code': HTTPStatus.CREATED,
+            'status': 'SUCCESS',
+        }
+
+
+@api_blueprint.route('/<path:manager_id>/studios', methods=['GET'])
+@format_response
+@query_budget(2)
+@cache.cached('studios')
+def get_studios(manager_id):
+    try:
+        include = parse_include(request.args.get('include', ''))
+    except ProjectionError as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_MANAGER_7',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        query = g.db_session.query(Studio, permission.c.role) \
+            .join(permission, permission.c.studio_id == Studio.id) \
+            .filter(
+                permission.c.manager_id == manager_id,
+                permission.c.deleted_at.is_(None),
+                Studio.deleted_at.is_(None)
+            ) \
+            .order_by(Studio.name.desc())
+        if 'social' in include:
+            query = query.options(selectinload(Studio.social))
+
+        result = []
+        for studio, role in query:
+            item = serialize_studio(studio, include)
+            item['role'] = role
+            result.append(item)
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_MANAGER_7',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_MANAGER_4',
+            'data': result,
+            'http_status_code': HTTPStatus.OK,
+            'status': 'SUCCESS',
+        }
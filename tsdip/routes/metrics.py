@@ -0,0 +1,46 @@
+from flask import Blueprint, Response
+
+from tsdip import cache, permissions
+from tsdip.metrics import Gauge, registry
+
+api_blueprint = Blueprint('metrics', __name__)
+
+registry.register(Gauge(
+    'tsdip_cache_hits_total',
+    'Response cache hits.',
+    lambda: cache.hits,
+    kind='counter',
+))
+registry.register(Gauge(
+    'tsdip_cache_misses_total',
+    'Response cache misses.',
+    lambda: cache.misses,
+    kind='counter',
+))
+registry.register(Gauge(
+    'tsdip_cache_evictions_total',
+    'Response cache entries evicted or expired.',
+    lambda: cache.stats()['evictions'],
+    kind='counter',
+))
+registry.register(Gauge(
+    'tsdip_permission_cache_hits_total',
+    'Permission checks answered from the role map cache.',
+    lambda: permissions.hits,
+    kind='counter',
+))
+registry.register(Gauge(
+    'tsdip_permission_cache_misses_total',
+    'Permission checks that loaded the role map from the database.',
+    lambda: permissions.misses,
+    kind='counter',
+))
+
+
+@api_blueprint.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of the metrics of this process."""
+    return Response(
+        registry.render(),
+        mimetype='text/plain; version=0.0.4',
+    )
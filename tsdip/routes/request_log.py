@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+from flask import Blueprint
+from flask import current_app as app
+from flask import g, request
+from marshmallow import Schema, ValidationError, fields, validate
+
+from tsdip import permissions
+from tsdip.approval import claim_pending, decide, resolve_targets
+from tsdip.formatter import format_response
+from tsdip.queries import query_budget
+
+api_blueprint = Blueprint('requests', __name__, url_prefix='/requests')
+
+
+class ClaimSchema(Schema):
+    type = fields.Str(validate=validate.OneOf(['studio', 'event', 'manager']))
+    limit = fields.Int(validate=validate.Range(min=1, max=500))
+
+
+class DecideSchema(Schema):
+    ids = fields.List(
+        fields.UUID(),
+        required=True,
+        validate=validate.Length(min=1, max=1000)
+    )
+    approve = fields.Bool(required=True)
+
+
+@api_blueprint.route('/claim', methods=['POST'])
+@format_response
+@permissions.require_admin
+@query_budget(5)
+def claim():
+    """Lease the oldest pending requests, skipping those claimed by others.
+
+    Each item embeds a summary of the studio, event or manager it asks
+    about as ``target``, loaded with one query per request type.
+    """
+    try:
+        params = ClaimSchema().load(request.get_json(silent=True) or {})
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_REQUEST_1',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        rows = claim_pending(
+            g.db_session,
+            g.manager_id,
+            request_type=params.get('type'),
+            limit=params.get('limit', 50),
+            lease=app.config['REQUEST_CLAIM_LEASE']
+        )
+        targets = resolve_targets(g.db_session, rows)
+
+        result = []
+        for row in rows:
+            item = row.as_dict()
+            item['target'] = targets.get((row.request, row.request_id))
+            result.append(item)
+        g.db_session.commit()
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_REQUEST_2',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_REQUEST_1',
+            'data': result,
+            'http_status_code': HTTPStatus.OK,
+            'status': 'SUCCESS',
+        }
+
+
+@api_blueprint.route('/decide', methods=['POST'])
+@format_response
+@permissions.require_admin
+@query_budget(1)
+def post_decide():
+    """Approve or reject up to 1000 requests in one statement."""
+    try:
+        data = DecideSchema().load(request.get_json())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        app.logger.error(err.valid_data)
+        return {
+            'code': 'ERROR_REQUEST_3',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        decided = decide(
+            g.db_session,
+            data['ids'],
+            data['approve'],
+            approve_by=g.manager_id
+        )
+        g.db_session.commit()
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_REQUEST_4',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        skipped = set(data['ids']) - set(decided)
+        return {
+            'code': 'ROUTE_REQUEST_2',
+            'data': {
+                'decided': decided,
+                'skipped': sorted(skipped, key=str),
+            },
+            'http_status_code': HTTPStatus.OK,
+            'status': 'SUCCESS',
+        }
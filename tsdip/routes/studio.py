@@ -3,10 +3,18 @@ from http import HTTPStatus
 from flask import Blueprint
 from flask import current_app as app
 from flask import g, request
-from marshmallow import Schema, ValidationError, fields
+from marshmallow import Schema, ValidationError, fields, validate
+from sqlalchemy.orm import joinedload, selectinload
 
+from tsdip import cache, permissions, tokens
 from tsdip.formatter import format_response
-from tsdip.models import Social, Studio
+from tsdip.importer import FORMATS, import_studios, iter_records
+from tsdip.models import Social, Studio, permission
+from tsdip.pagination import CursorError, keyset_paginate
+from tsdip.projection import (ProjectionError, load_socials, parse_fields,
+                              parse_include, row_subset, select_columns)
+from tsdip.queries import query_budget
+from tsdip.search import SearchSchema, search
 
 api_blueprint = Blueprint('studios', __name__, url_prefix='/studios')
 
@@ -16,10 +24,20 @@ class StudioSchema(Schema):
     address = fields.Str(required=True)
 
 
+class StudioListSchema(Schema):
+    limit = fields.Int(validate=validate.Range(min=1, max=50))
+    page = fields.Int(validate=validate.Range(min=0))
+    cursor = fields.Str()
+    include = fields.Str()
+    columns = fields.Str(data_key='fields')
+
+
 @api_blueprint.route('/create', methods=['POST'])
 @format_response
+@tokens.login_required
+@query_budget(4)
 def create():
-    """ """
+    """Create a studio owned by the authenticated manager."""
     try:
         StudioSchema().load(request.get_json())
     except ValidationError as err:
@@ -41,9 +59,17 @@ def create():
             address=address
         )
         g.db_session.add(row)
+        g.db_session.flush()
+        g.db_session.execute(permission.insert().values(
+            manager_id=g.manager_id,
+            studio_id=row.id,
+            role='owner'
+        ))
         g.db_session.commit()
         g.db_session.refresh(row)
         res = row.as_dict()
+        cache.invalidate('studios')
+        permissions.invalidate(g.manager_id)
     except Exception as err:
         app.logger.error(err)
         g.db_session.rollback()
@@ -63,25 +89,160 @@ def create():
         }
 
 
+def serialize_studio(studio, include=()):
+    """
+    :param studio: Studio instance
+    :param include: relations to embed (Default value = ())
+    """
+    res = studio.as_dict()
+    if 'social' in include:
+        res['social'] = studio.social.as_dict() if studio.social else None
+    return res
+
+
+@api_blueprint.route('/import', methods=['POST'])
+@format_response
+@permissions.require_admin
+def bulk_import():
+    """Stream a CSV or NDJSON request body into the studio table."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in FORMATS:
+        return {
+            'code': 'ERROR_STUDIO_9',
+            'description': f'Format must be one of {", ".join(FORMATS)}',
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    rejects = []
+
+    def on_reject(line_num, record, errors):
+        if len(rejects) < 100:
+            rejects.append({'errors': errors, 'line': line_num})
+
+    try:
+        inserted, rejected = import_studios(
+            g.db_session,
+            iter_records(request.stream, fmt),
+            on_reject=on_reject
+        )
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_STUDIO_10',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_AUTH_5',
+            'data': {
+                'inserted': inserted,
+                'rejected': rejected,
+                'rejects': rejects,
+            },
+            'http_status_code': HTTPStatus.CREATED,
+            'status': 'SUCCESS',
+        }
+
+
 @api_blueprint.route('', methods=['GET'])
 @format_response
+@query_budget(3)
+@cache.cached('studios')
 def get_list():
-    params = request.args.to_dict()
-    limit = int(params['limit']) if 'limit' in params and int(
-        params['limit']) < 50 else 10
-    page = int(params['page']) if 'page' in params and int(
-        params['page']) != 0 else 1
+    try:
+        params = StudioListSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_STUDIO_7',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+    limit = params.get('limit', 10)
+
+    try:
+        include = parse_include(params.get('include', ''))
+        names = parse_fields(Studio, params['columns']) \
+            if 'columns' in params else None
+    except ProjectionError as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_STUDIO_7',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    if names:
+        required = ('name', 'id', 'social_id') if 'social' in include \
+            else ('name', 'id')
+        query = g.db_session.query(
+            *select_columns(Studio, names, required=required)
+        )
+
+        def serialize_page(rows):
+            items = [row_subset(row, names) for row in rows]
+            if 'social' in include:
+                socials = load_socials(
+                    g.db_session, [row.social_id for row in rows]
+                )
+                for item, row in zip(items, rows):
+                    item['social'] = socials.get(row.social_id)
+            return items
+    else:
+        query = g.db_session.query(Studio)
+        if 'social' in include:
+            query = query.options(selectinload(Studio.social))
+
+        def serialize_page(rows):
+            return [serialize_studio(row, include) for row in rows]
+
+    query = query.filter(Studio.deleted_at.is_(None))
+
+    if 'page' in params:
+        page = params['page'] or 1
+        try:
+            data = query.order_by(Studio.name.desc()) \
+                .paginate(page=page, per_page=limit, error_out=False)
+            result = serialize_page(data.items)
+        except Exception as err:
+            app.logger.error(err)
+            return {
+                'code': 'ERROR_STUDIO_3',
+                'description': str(err),
+                'http_status_code': HTTPStatus.INTERNAL_SERVER_ERROR,
+                'status': 'ERROR',
+            }
+        else:
+            return {
+                'code': 'ROUTE_AUTH_2',
+                'data': result,
+                'http_status_code': HTTPStatus.OK,
+                'status': 'SUCCESS',
+            }
 
     try:
-        data = g.db_session.query(Studio) \
-            .filter(Studio.deleted_at.is_(None)) \
-            .order_by(Studio.name.desc()) \
-            .paginate(page=page, per_page=limit)
-
-        result = []
-        while data.has_next or data.page == data.pages:
-            result = result + [item.as_dict() for item in tuple(data.items)]
-            data = data.next()
+        rows, next_cursor = keyset_paginate(
+            query,
+            (Studio.name, Studio.id),
+            cursor=params.get('cursor'),
+            limit=limit
+        )
+        items = serialize_page(rows)
+    except CursorError as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_STUDIO_7',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
     except Exception as err:
         app.logger.error(err)
         return {
@@ -93,12 +254,104 @@ def get_list():
     else:
         return {
             'code': 'ROUTE_AUTH_2',
+            'data': {
+                'items': items,
+                'next_cursor': next_cursor,
+            },
+            'http_status_code': HTTPStatus.OK,
+            'status': 'SUCCESS',
+        }
+
+
+@api_blueprint.route('/search', methods=['GET'])
+@format_response
+@query_budget(1)
+@cache.cached('studios')
+def search_list():
+    try:
+        params = SearchSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        app.logger.error(err.messages)
+        return {
+            'code': 'ERROR_STUDIO_11',
+            'description': err.messages,
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        result = search(
+            g.db_session,
+            Studio,
+            params['q'],
+            limit=params.get('limit', 10)
+        )
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+
+        return {
+            'code': 'ERROR_STUDIO_12',
+            'description': str(err),
+            'http_status_code': HTTPStatus.INTERNAL_SERVER_ERROR,
+            'status': 'ERROR',
+        }
+    else:
+        return {
+            'code': 'ROUTE_AUTH_6',
             'data': result,
             'http_status_code': HTTPStatus.OK,
             'status': 'SUCCESS',
         }
 
 
+@api_blueprint.route('/<path:studio_id>', methods=['GET'])
+@format_response
+@query_budget(1)
+@cache.cached('studios')
+def get(studio_id):
+    try:
+        include = parse_include(request.args.get('include', ''))
+    except ProjectionError as err:
+        app.logger.error(err)
+        return {
+            'code': 'ERROR_STUDIO_8',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    try:
+        query = g.db_session.query(Studio) \
+            .filter(Studio.id == studio_id, Studio.deleted_at.is_(None))
+        if 'social' in include:
+            query = query.options(joinedload(Studio.social))
+        studio = query.one_or_none()
+    except Exception as err:
+        app.logger.error(err)
+        g.db_session.rollback()
+        return {
+            'code': 'ERROR_STUDIO_8',
+            'description': str(err),
+            'http_status_code': HTTPStatus.BAD_REQUEST,
+            'status': 'ERROR',
+        }
+
+    if studio is None:
+        return {
+            'code': 'ERROR_STUDIO_5',
+            'http_status_code': HTTPStatus.NOT_FOUND,
+            'status': 'ERROR',
+        }
+
+    return {
+        'code': 'ROUTE_AUTH_4',
+        'data': serialize_studio(studio, include),
+        'http_status_code': HTTPStatus.OK,
+        'status': 'SUCCESS',
+    }
+
+
 class SocialSchema(Schema):
     email = fields.Email()
     fan_page = fields.Str()
@@ -111,6 +364,8 @@ class SocialSchema(Schema):
 
 @api_blueprint.route('/<path:studio_id>', methods=['PATCH'])
 @format_response
+@permissions.require_role('manager')
+@query_budget(4)
 def patch_social(studio_id):
     try:
         SocialSchema().load(request.get_json())
@@ -151,6 +406,7 @@ def patch_social(studio_id):
         g.db_session.add(studio)
         g.db_session.commit()
         res = row.as_dict()
+        cache.invalidate('studios')
     except Exception as err:
         app.logger.error(err)
         g.db_session.rollback()
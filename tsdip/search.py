@@ -0,0 +1,67 @@
+import re
+
+import sqlalchemy
+from marshmallow import Schema, fields, validate
+from sqlalchemy import desc, func, or_
+
+SEARCH_CONFIG = 'pg_catalog.simple'
+# pg_trgm similarity operator, SQLAlchemy 1.3 does not escape it for psycopg2
+TRIGRAM_MATCH = '%%' if sqlalchemy.__version__.startswith('1.3.') else '%'
+# Matches ranked per query, broad queries would otherwise rank the table
+SEARCH_CANDIDATES = 500
+
+
+class SearchSchema(Schema):
+    q = fields.Str(required=True, validate=validate.Length(min=3, max=100))
+    limit = fields.Int(validate=validate.Range(min=1, max=50))
+
+
+def prefix_tsquery(q):
+    """Turn free text into a prefix tsquery, e.g. 'hip ho' -> 'hip:* & ho:*'.
+
+    :param q: user input, everything but word characters is dropped
+    """
+    return ' & '.join(f'{token}:*' for token in re.findall(r'\w+', q))
+
+
+def search(session, model, q, limit=10, candidates=SEARCH_CANDIDATES):
+    """Rank live rows of ``model`` by full-text match and name similarity.
+
+    The tsvector match serves word prefixes, the trigram match on name
+    serves partial words and CJK names the simple parser keeps whole.
+    Only the ``candidates`` matches closest to ``q`` by trigram distance,
+    read in order from the GiST index on name, are ranked, so a query
+    matching most of the table costs the same as a selective one and an
+    exact name is always among them.
+
+    :param session: database session
+    :param model: Studio or Event
+    :param q: search text
+    :param limit: maximum number of results (Default value = 10)
+    :param candidates: matches to rank (Default value = SEARCH_CANDIDATES)
+    """
+    conditions = [model.name.op(TRIGRAM_MATCH)(q)]
+    rank = func.similarity(model.name, q)
+
+    tsquery = prefix_tsquery(q)
+    if tsquery:
+        query_vector = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        conditions.append(model.search_vector.op('@@')(query_vector))
+        rank = func.ts_rank_cd(model.search_vector, query_vector) + rank
+
+    matches = session.query(model.id) \
+        .filter(model.deleted_at.is_(None), or_(*conditions)) \
+        .order_by(model.name.op('<->')(q)) \
+        .limit(candidates)
+    rows = session.query(model, rank.label('rank')) \
+        .filter(model.id.in_(matches)) \
+        .order_by(desc('rank')) \
+        .limit(limit) \
+        .all()
+
+    result = []
+    for row, score in rows:
+        item = row.as_dict()
+        item['rank'] = float(score)
+        result.append(item)
+    return result
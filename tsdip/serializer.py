@@ -0,0 +1,69 @@
+import json
+import uuid
+from datetime import date, datetime
+from operator import attrgetter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_accessors = {}
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def dumpb(obj):
+    """Serialize to UTF-8 JSON bytes, with orjson when it is installed.
+
+    :param obj: JSON compatible value, may contain UUID and datetime
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj):
+    """
+    :param obj: JSON compatible value, may contain UUID and datetime
+    """
+    return dumpb(obj).decode('utf-8')
+
+
+def column_names(model):
+    """Names of the columns exposed in API payloads.
+
+    Columns flagged with ``info={'internal': True}`` are left out.
+
+    :param model: model class
+    """
+    return tuple(
+        c.name for c in model.__table__.columns if not c.info.get('internal')
+    )
+
+
+def _accessor(model):
+    try:
+        return _accessors[model]
+    except KeyError:
+        names = column_names(model)
+        getter = attrgetter(*names)
+        if len(names) == 1:
+            getter = (lambda get: lambda row: (get(row),))(getter)
+        _accessors[model] = names, getter
+        return _accessors[model]
+
+
+def row_to_dict(row):
+    """Column values of a model instance, read with one precompiled getter.
+
+    :param row: model instance
+    """
+    names, getter = _accessor(type(row))
+    return dict(zip(names, getter(row)))